@@ -0,0 +1,151 @@
+"""Exact and near-duplicate question detection for merged banks
+
+Exact duplicates are found by hashing normalized question and option text.
+Near-duplicates are found with MinHash signatures bucketed by locality-sensitive
+hashing (LSH), so only questions that share a bucket are ever compared and the
+work grows roughly linearly with the bank instead of with every pair.
+"""
+import re
+from collections import defaultdict, namedtuple
+
+# Signature size and banding; a pair with Jaccard similarity s becomes a candidate
+# with probability 1 - (1 - s**ROWS)**BANDS, which is ~99% at 0.7 and ~8% at 0.1
+SIGNATURE_SIZE = 16
+BANDS = 8
+ROWS = SIGNATURE_SIZE // BANDS
+
+# Candidates at least this similar (Jaccard over word shingles) are reported as near-duplicates
+NEAR_DUPLICATE_THRESHOLD = 0.7
+
+# Buckets larger than this come from boilerplate shared by many questions, not duplicates
+MAX_BUCKET_SIZE = 200
+
+DuplicateCluster = namedtuple('DuplicateCluster', ['kind', 'indices', 'similarity'])
+
+_WORD = re.compile(r"\w+")
+_HASH_MASK = (1 << 64) - 1
+
+
+def normalize_text(text):
+    """Lowercase text and reduce it to its words, ignoring punctuation and spacing"""
+    return " ".join(_WORD.findall(str(text).lower()))
+
+
+def question_key(question):
+    """Normalized question text plus sorted option texts; equal keys are exact duplicates"""
+    options = question.get('options') or {}
+    return " | ".join([normalize_text(question.get('question', ''))] +
+                      sorted(normalize_text(text) for text in options.values()))
+
+
+def _shingles(text):
+    """Words and word pairs of normalized text, hashed to 64-bit integers
+
+    Python's string hash is fast and stable within a process, which is all a
+    single clustering run needs.
+    """
+    words = text.split()
+    shingles = {hash(word) & _HASH_MASK for word in words}
+    shingles.update(hash(pair) & _HASH_MASK for pair in zip(words, words[1:]))
+    return shingles
+
+
+def minhash_signature(shingles, size=SIGNATURE_SIZE):
+    """One-permutation MinHash: the minimum hash per bin, densified for empty bins"""
+    bins = [None] * size
+    for value in shingles:
+        slot = value % size
+        current = bins[slot]
+        if current is None or value < current:
+            bins[slot] = value
+    # Empty bins borrow from the next filled bin so similar sets still agree on them
+    filled = [i for i, value in enumerate(bins) if value is not None]
+    if not filled:
+        return tuple(bins)
+    for i in range(size):
+        if bins[i] is None:
+            donor = next((j for j in filled if j > i), filled[0])
+            bins[i] = (bins[donor] + (donor - i) % size * 0x9E3779B97F4A7C15) & _HASH_MASK
+    return tuple(bins)
+
+
+def _find(parents, i):
+    while parents[i] != i:
+        parents[i] = parents[parents[i]]
+        i = parents[i]
+    return i
+
+
+def find_duplicate_clusters(questions, threshold=NEAR_DUPLICATE_THRESHOLD):
+    """Group exact and near-duplicate questions
+
+    Returns a list of DuplicateCluster(kind, indices, similarity) where kind is
+    'exact' or 'near', indices are positions in `questions` (first one is the
+    one to keep) and similarity is the lowest pairwise similarity that joined
+    the cluster.
+    """
+    # Exact duplicates: identical normalized question and options
+    exact_groups = defaultdict(list)
+    for index, question in enumerate(questions):
+        exact_groups[question_key(question)].append(index)
+
+    clusters = [DuplicateCluster('exact', indices, 1.0)
+                for indices in exact_groups.values() if len(indices) > 1]
+
+    # Near duplicates among one representative per exact group, compared on the
+    # question text alone since options are often generic ("True", "All of the above")
+    representatives = [indices[0] for indices in exact_groups.values()]
+    shingle_sets = {}
+    # Most buckets hold a single question, so only buckets that collide get a list
+    first_in_bucket = {}
+    buckets = defaultdict(list)
+    for index in representatives:
+        shingles = _shingles(normalize_text(questions[index].get('question', '')))
+        if not shingles:
+            # No words to compare; such questions can only be exact duplicates
+            continue
+        shingle_sets[index] = shingles
+        signature = minhash_signature(shingles)
+        for band in range(BANDS):
+            bucket = (band,) + signature[band * ROWS:(band + 1) * ROWS]
+            first = first_in_bucket.setdefault(bucket, index)
+            if first != index:
+                members = buckets[bucket]
+                if not members:
+                    members.append(first)
+                members.append(index)
+
+    parents = {index: index for index in representatives}
+    weakest = {}
+    compared = set()
+    for members in buckets.values():
+        if len(members) > MAX_BUCKET_SIZE:
+            continue
+        for a_pos, a in enumerate(members):
+            for b in members[a_pos + 1:]:
+                if (a, b) in compared:
+                    continue
+                compared.add((a, b))
+                root_a, root_b = _find(parents, a), _find(parents, b)
+                if root_a == root_b:
+                    continue
+                set_a, set_b = shingle_sets[a], shingle_sets[b]
+                similarity = len(set_a & set_b) / len(set_a | set_b)
+                if similarity >= threshold:
+                    root, child = min(root_a, root_b), max(root_a, root_b)
+                    parents[child] = root
+                    weakest[root] = min(similarity, weakest.get(root, 1.0), weakest.pop(child, 1.0))
+
+    near_groups = defaultdict(list)
+    for index in representatives:
+        near_groups[_find(parents, index)].append(index)
+    clusters.extend(DuplicateCluster('near', sorted(indices), round(weakest.get(root, 1.0), 3))
+                    for root, indices in near_groups.items() if len(indices) > 1)
+    clusters.sort(key=lambda cluster: cluster.indices[0])
+    return clusters
+
+
+def drop_duplicates(questions, clusters):
+    """Return the questions with all but the first member of every cluster removed"""
+    dropped = {index for cluster in clusters for index in cluster.indices[1:]}
+    return [question for index, question in enumerate(questions) if index not in dropped]
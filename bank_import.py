@@ -0,0 +1,559 @@
+"""Reading and validating question banks from JSON, NDJSON and CSV files and upload streams"""
+import csv
+import glob
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import re
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from exam_state import MAX_OPTION_CODES
+
+# Keys that commonly hold the question list in uploaded banks, in priority order
+QUESTION_LIST_KEYS = [
+    "programming_languages_exam_questions",
+    "chemistry_questions",
+    "questions",
+    "quiz_questions",
+    "exam_questions",
+    "question_bank",
+    "items"
+]
+
+JSON_WHITESPACE = " \t\n\r"
+
+# File extensions of the supported bank formats
+BANK_FORMATS = {
+    '.json': 'json',
+    '.ndjson': 'ndjson',
+    '.jsonl': 'ndjson',
+    '.csv': 'csv',
+}
+
+# CSV columns holding options: "A", "option_A", "Option B", "optionC"...
+CSV_OPTION_COLUMN = re.compile(r"^(?:option[ _]?)?([A-Z])$", re.IGNORECASE)
+
+# field -> (accepted types, required) for a single question
+QUESTION_SCHEMA = {
+    'question': (str, True),
+    'options': (dict, True),
+    'correct_answer': (str, True),
+    'id': ((int, str), False),
+    'topic': (str, False),
+    'category': (str, False),
+    'explanation': ((str, type(None)), False),
+    'page': ((int, str), False),
+}
+
+# Key the importer adds to merged questions naming the file and item they came from;
+# it is not part of the schema, so a bank's own fields are never overwritten
+PROVENANCE_FIELD = 'provenance'
+
+# One problem found in a bank; errors make the item unusable, warnings don't.
+# `file` names the bank the item is from when several are imported together.
+BankIssue = namedtuple('BankIssue', ['index', 'field', 'message', 'severity', 'file'], defaults=(None,))
+
+# Most worker processes a multi-file import starts, so one import can't claim every core
+IMPORT_MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+# Outcome of parsing one file of a multi-file import
+ImportedFile = namedtuple('ImportedFile', ['name', 'questions', 'issues', 'seconds', 'error'])
+
+
+def hash_stream(binary_stream, chunk_size=1024 * 1024):
+    """Return the SHA-256 of a binary stream's content and rewind it"""
+    digest = hashlib.sha256()
+    binary_stream.seek(0)
+    for chunk in iter(lambda: binary_stream.read(chunk_size), b''):
+        digest.update(chunk)
+    binary_stream.seek(0)
+    return digest.hexdigest()
+
+
+class BankParseError(ValueError):
+    """Raised when a streamed question bank is not valid JSON"""
+
+
+def validate_question_structure(question):
+    """Validate that the question has the required structure"""
+    if not isinstance(question, dict):
+        return False
+
+    required_fields = ['question', 'options', 'correct_answer']
+    return all(field in question for field in required_fields)
+
+
+def extract_questions_from_data(data):
+    """Extract questions from JSON data structure"""
+    # If data is already a list of questions
+    if isinstance(data, list) and len(data) > 0:
+        if validate_question_structure(data[0]):
+            return data
+
+    # Look for questions in common keys
+    for key in QUESTION_LIST_KEYS:
+        if key in data and isinstance(data[key], list) and len(data[key]) > 0:
+            questions = data[key]
+            if validate_question_structure(questions[0]):
+                return questions
+
+    # If no standard key found, look for any list with question structure
+    for key, value in data.items():
+        if isinstance(value, list) and len(value) > 0:
+            if validate_question_structure(value[0]):
+                return value
+
+    return None
+
+
+class InvalidItem:
+    """Stands in for an item a reader could not decode, so it is reported but not fatal"""
+
+    __slots__ = ('message',)
+
+    def __init__(self, message):
+        self.message = message
+
+
+def _type_names(types):
+    types = types if isinstance(types, tuple) else (types,)
+    names = {str: "string", int: "integer", dict: "object", type(None): "null"}
+    return " or ".join(names.get(t, t.__name__) for t in types)
+
+
+class BankValidator:
+    """Checks every question of a bank against a schema in a single pass
+
+    The schema is compiled into flat tuples once, so checking an item is a handful
+    of dict lookups. Items can be fed one at a time while streaming (check) or as
+    a whole bank (validate). Issues accumulate in `issues` with the item index.
+    Duplicate ids are reported unless `check_ids` is off, for callers that check
+    them across several files with duplicate_id_issues.
+    """
+
+    def __init__(self, schema=QUESTION_SCHEMA, check_ids=True):
+        self.required = tuple(field for field, (_, required) in schema.items() if required)
+        self.typed = tuple((field, types, _type_names(types)) for field, (types, _) in schema.items())
+        self.issues = []
+        self._seen_ids = {} if check_ids else None
+
+    def check(self, question, index):
+        """Record any issues with one item and return True if it is usable"""
+        if type(question) is not dict:
+            message = question.message if isinstance(question, InvalidItem) else "item is not an object"
+            self.issues.append(BankIssue(index, None, message, 'error'))
+            return False
+
+        issues = self.issues
+        found = len(issues)
+        for field in self.required:
+            if field not in question:
+                issues.append(BankIssue(index, field, "missing required field", 'error'))
+        for field, types, type_names in self.typed:
+            if field in question and not isinstance(question[field], types):
+                issues.append(BankIssue(index, field, f"expected {type_names}", 'error'))
+        if len(issues) > found:
+            return False
+
+        options = question['options']
+        if not options:
+            issues.append(BankIssue(index, 'options', "no options given", 'error'))
+        elif len(options) > MAX_OPTION_CODES:
+            issues.append(BankIssue(index, 'options', f"more than {MAX_OPTION_CODES} options", 'error'))
+        for label, text in options.items():
+            if not isinstance(text, str):
+                issues.append(BankIssue(index, 'options', f"option {label} is not a string", 'error'))
+        if question['correct_answer'] not in options:
+            issues.append(BankIssue(
+                index, 'correct_answer',
+                f"'{question['correct_answer']}' is not one of the options ({', '.join(options)})", 'error'))
+        if len(issues) > found:
+            return False
+
+        question_id = question.get('id')
+        if question_id is not None and self._seen_ids is not None:
+            first_index = self._seen_ids.setdefault(question_id, index)
+            if first_index != index:
+                issues.append(BankIssue(index, 'id', f"duplicate id {question_id!r} (first used by item {first_index + 1})", 'warning'))
+        return True
+
+    def validate(self, questions):
+        """Check a whole bank and return the issues found"""
+        check = self.check
+        for index, question in enumerate(questions):
+            check(question, index)
+        return self.issues
+
+
+def validate_bank(questions, schema=QUESTION_SCHEMA):
+    """Return every BankIssue in a list of questions"""
+    return BankValidator(schema).validate(questions)
+
+
+def duplicate_id_issues(questions):
+    """Return a warning for every question that reuses an earlier question's id
+
+    Questions come from import_bank_files, so each issue is indexed and tagged by
+    the file and item in the question's provenance.
+    """
+    seen = {}
+    issues = []
+    for question in questions:
+        question_id = question.get('id')
+        if question_id is None:
+            continue
+        provenance = question[PROVENANCE_FIELD]
+        first = seen.setdefault(question_id, provenance)
+        if first is not provenance:
+            issues.append(BankIssue(
+                provenance['item'] - 1, 'id',
+                f"duplicate id {question_id!r} (first used by item {first['item']} of {first['file']})",
+                'warning', provenance['file']))
+    return issues
+
+
+class _JSONStreamReader:
+    """Decodes JSON values one at a time from a text stream with a bounded buffer
+
+    Object keys are shared across values: the decoder only reuses key strings within
+    one call, so without this every question would carry its own copies of
+    "question", "options", "A"...
+    """
+
+    def __init__(self, stream, chunk_size=64 * 1024):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        keys = {}
+        self.decoder = json.JSONDecoder(
+            object_pairs_hook=lambda pairs: {keys.setdefault(key, key): value for key, value in pairs})
+        self.buf = ''
+        self.pos = 0
+        # Characters consumed before the start of buf, for error messages
+        self.offset = 0
+        self.eof = False
+
+    def _fill(self, size=None):
+        """Read more text, dropping what has already been consumed"""
+        if self.eof:
+            return False
+        chunk = self.stream.read(size or self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.offset += self.pos
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def _error(self, message):
+        return BankParseError(f"{message} at character {self.offset + self.pos}")
+
+    def peek(self):
+        """Return the next non-whitespace character without consuming it, or '' at EOF"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in JSON_WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise self._error(f"Expecting '{char}'")
+        self.pos += 1
+
+    def value(self):
+        """Decode and consume the next complete JSON value"""
+        self.peek()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+                # A number that ends at the end of the buffer may continue in the next chunk
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError as e:
+                if self.eof:
+                    raise self._error(e.msg) from None
+            # The value spans past the buffer; read more, growing the read size so
+            # a very large value isn't re-decoded once per chunk
+            self._fill(size)
+            size *= 2
+
+    def items(self):
+        """Consume a JSON array element by element"""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            char = self.peek()
+            self.pos += 1
+            if char == ']':
+                return
+            if char != ',':
+                self.pos -= 1
+                raise self._error("Expecting ',' or ']'")
+
+    def members(self):
+        """Consume a JSON object, yielding each key with the reader positioned at its value"""
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            if self.peek() != '"':
+                raise self._error("Expecting property name")
+            key = self.value()
+            self.expect(':')
+            yield key
+            char = self.peek()
+            self.pos += 1
+            if char == '}':
+                return
+            if char != ',':
+                self.pos -= 1
+                raise self._error("Expecting ',' or '}'")
+
+
+def _iter_question_list(reader):
+    """Yield the items of the array at the reader if its first item is a question"""
+    items = reader.items()
+    for first in items:
+        if not validate_question_structure(first):
+            # Not a question list; still consume it to move past it
+            for _ in items:
+                pass
+            return False
+        yield first
+        yield from items
+        return True
+    return False
+
+
+def iter_questions_from_text_stream(stream):
+    """Yield the questions in a JSON bank one by one without loading the whole document
+
+    Accepts the same layouts as extract_questions_from_data: a top-level list of
+    questions, or an object with a list of questions under some key. Keys are
+    examined in document order, so the first question list wins.
+    """
+    reader = _JSONStreamReader(stream)
+    char = reader.peek()
+    if char == '[':
+        yield from _iter_question_list(reader)
+        return
+    if char != '{':
+        raise reader._error("Expecting a JSON object or array")
+    for _ in reader.members():
+        if reader.peek() == '[':
+            found = yield from _iter_question_list(reader)
+            if found:
+                return
+        else:
+            # Skip non-list values without keeping them
+            reader.value()
+
+
+def iter_questions_from_ndjson(stream):
+    """Yield one question per non-blank line of a line-delimited JSON stream
+
+    Lines that aren't valid JSON come through as InvalidItem, so a torn line at the
+    end of a file that is still being appended to doesn't stop the import.
+    """
+    for line_number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            yield InvalidItem(f"line {line_number} is not valid JSON: {e}")
+
+
+def csv_row_to_question(row):
+    """Convert one CSV row into the question structure used by JSON banks"""
+    question = {'options': {}}
+    for column, value in row.items():
+        if column is None or value is None:
+            continue
+        column = column.strip()
+        value = value.strip()
+        option = CSV_OPTION_COLUMN.match(column)
+        if option:
+            if value:
+                question['options'][option.group(1).upper()] = value
+            continue
+        column = column.lower()
+        if not value:
+            continue
+        if column in ('id', 'page') and value.isdigit():
+            question[column] = int(value)
+        elif column == 'correct_answer':
+            question[column] = value.upper() if len(value) == 1 else value
+        else:
+            question[column] = value
+    return question
+
+
+def iter_questions_from_csv(stream):
+    """Yield one question per row of a CSV stream with a header row
+
+    Expected columns are id, topic, question, correct_answer and explanation, plus
+    one column per option named A, B, C... or option_A, option_B...
+    """
+    for row in csv.DictReader(stream):
+        yield csv_row_to_question(row)
+
+
+BANK_READERS = {
+    'json': iter_questions_from_text_stream,
+    'ndjson': iter_questions_from_ndjson,
+    'csv': iter_questions_from_csv,
+}
+
+
+def detect_bank_format(name):
+    """Return the bank format for a file name from its extension, defaulting to JSON"""
+    return BANK_FORMATS.get(os.path.splitext(name or '')[1].lower(), 'json')
+
+
+def read_questions_from_stream(binary_stream, schema=QUESTION_SCHEMA, bank_format='json'):
+    """Stream a bank from a binary file object, validating each item as it arrives
+
+    `bank_format` is 'json', 'ndjson' or 'csv'. Returns (questions, issues): the
+    usable questions and the BankIssues found, indexed by position in the source.
+    Items with errors are left out. The stream is decoded as UTF-8, falling back
+    to Latin-1 when it isn't valid UTF-8.
+    """
+    questions, _, issues = read_positioned_questions_from_stream(binary_stream, schema, bank_format)
+    return questions, issues
+
+
+def read_positioned_questions_from_stream(binary_stream, schema=QUESTION_SCHEMA, bank_format='json',
+                                          check_ids=True):
+    """Like read_questions_from_stream, but returns (questions, positions, issues)
+    where positions[i] is the index in the source of questions[i]"""
+    reader = BANK_READERS[bank_format]
+    for encoding in ('utf-8-sig', 'latin-1'):
+        binary_stream.seek(0)
+        # The csv module does its own newline handling
+        text_stream = io.TextIOWrapper(binary_stream, encoding=encoding,
+                                       newline='' if bank_format == 'csv' else None)
+        validator = BankValidator(schema, check_ids)
+        questions = []
+        positions = []
+        try:
+            for index, item in enumerate(reader(text_stream)):
+                if validator.check(item, index):
+                    questions.append(item)
+                    positions.append(index)
+            return questions, positions, validator.issues
+        except UnicodeDecodeError:
+            if encoding == 'latin-1':
+                raise
+        finally:
+            # Leave the caller's stream open
+            text_stream.detach()
+
+
+def parse_bank_source(source, root=None):
+    """Parse one bank given as a path or a (name, bytes) pair into an ImportedFile
+
+    Paths are named relative to `root` when given. Each question gets a provenance
+    entry with the file name and its 1-based item number in the file, and each issue
+    the file name. Runs in worker processes, so it catches its own errors and only
+    returns plain, picklable data. Duplicate ids are left to import_bank_files,
+    which checks them across all the files.
+    """
+    start = time.perf_counter()
+    if isinstance(source, tuple):
+        name, data = source
+    else:
+        name = os.path.relpath(source, root) if root else os.path.basename(source)
+        data = None
+    bank_format = detect_bank_format(name)
+    try:
+        if data is None:
+            with open(source, 'rb') as f:
+                questions, positions, issues = read_positioned_questions_from_stream(
+                    f, bank_format=bank_format, check_ids=False)
+        else:
+            questions, positions, issues = read_positioned_questions_from_stream(
+                io.BytesIO(data), bank_format=bank_format, check_ids=False)
+        for question, position in zip(questions, positions):
+            question[PROVENANCE_FIELD] = {'file': name, 'item': position + 1}
+        issues = [issue._replace(file=name) for issue in issues]
+        error = None if questions else "no valid questions found"
+    except (BankParseError, UnicodeDecodeError, OSError) as e:
+        questions, issues, error = [], [], str(e)
+    return ImportedFile(name, questions, issues, time.perf_counter() - start, error)
+
+
+def resolve_import_folder(folder, root):
+    """Return the real path of a server folder to import from, which must lie inside `root`
+
+    Relative folders are taken from the root. Raises ValueError when no root is
+    configured, or the folder is outside it (symlinks included) or doesn't exist.
+    """
+    if not root:
+        raise ValueError("Folder import is disabled; set EXAM_IMPORT_ROOT to allow it")
+    root = os.path.realpath(root)
+    path = os.path.realpath(os.path.join(root, folder))
+    if os.path.commonpath([root, path]) != root:
+        raise ValueError(f"{folder} is outside the import folder")
+    if not os.path.isdir(path):
+        raise ValueError(f"Folder not found: {folder}")
+    return path
+
+
+def find_bank_files(directory):
+    """Return the bank files of any supported format under a directory, sorted so
+    imports are reproducible
+
+    Files that resolve outside the directory through a symlink are left out.
+    """
+    directory = os.path.realpath(directory)
+    return sorted(path for path in glob.glob(os.path.join(directory, "**", "*"), recursive=True)
+                  if os.path.isfile(path) and os.path.splitext(path)[1].lower() in BANK_FORMATS
+                  and os.path.commonpath([directory, os.path.realpath(path)]) == directory)
+
+
+def import_bank_files(sources, root=None, max_workers=IMPORT_MAX_WORKERS):
+    """Parse and validate many banks in a process pool and merge them into one
+
+    Sources are paths (named relative to `root`) or (name, bytes) pairs. Every merged question gets a
+    `provenance` field naming the file and item it came from. Returns
+    (questions, reports) with one ImportedFile per source, in input order;
+    report.questions holds the count rather than the questions themselves.
+    Duplicate ids are reported across all the files, in the report of the file
+    holding the duplicate.
+    """
+    sources = list(sources)
+    parse = partial(parse_bank_source, root=root)
+    if len(sources) <= 1:
+        results = [parse(source) for source in sources]
+    else:
+        # Spawn rather than fork: the web server process runs many threads
+        with ProcessPoolExecutor(max_workers=min(max_workers or IMPORT_MAX_WORKERS, IMPORT_MAX_WORKERS,
+                                                 len(sources)),
+                                 mp_context=multiprocessing.get_context("spawn")) as pool:
+            results = list(pool.map(parse, sources, chunksize=4))
+
+    questions = []
+    for result in results:
+        questions.extend(result.questions)
+    duplicates = {}
+    for issue in duplicate_id_issues(questions):
+        duplicates.setdefault(issue.file, []).append(issue)
+    reports = [result._replace(questions=len(result.questions),
+                               issues=result.issues + duplicates.get(result.name, []))
+               for result in results]
+    return questions, reports
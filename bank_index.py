@@ -0,0 +1,244 @@
+"""Indexes built once per question bank and shared by every session using it"""
+import heapq
+import math
+import re
+from array import array
+from collections import Counter, defaultdict
+from itertools import islice
+
+# "(Hard)", "(Advanced)"... qualifiers don't start a new branch of the taxonomy
+TOPIC_QUALIFIER = re.compile(r"\s*\([^)]*\)\s*$")
+
+# Explicit hierarchy inside a topic or category: "CV > Formatting", "CV / Formatting", "CV: Formatting"
+TOPIC_SEPARATOR = re.compile(r"\s+[>/]\s+|:\s+")
+
+# One-word prefixes that never make a useful category
+PREFIX_STOPWORDS = {"a", "an", "the", "how", "what", "why", "when", "which"}
+
+# BM25 term-frequency saturation and document-length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# At most this many postings are read per query term, strongest first
+SEARCH_POSTINGS_LIMIT = 5000
+
+_SEARCH_TOKEN = re.compile(r"\w+")
+
+
+def search_tokens(text):
+    """Lowercased words of a text, as indexed and queried by SearchIndex"""
+    return _SEARCH_TOKEN.findall(str(text).casefold())
+
+
+def question_search_text(question):
+    """The searchable text of a question: the question, its options and its explanation"""
+    options = question.get('options') or {}
+    return " ".join([str(question.get('question', ''))] + [str(text) for text in options.values()] +
+                    [str(question.get('explanation') or '')])
+
+
+class TopicIndex:
+    """Inverted index from each topic to the bank positions of its questions
+
+    Topics keep the order in which they first appear in the bank.
+    """
+
+    __slots__ = ('positions',)
+
+    def __init__(self, bank):
+        self.positions = {}
+        for position, question in enumerate(bank):
+            topic = question.get('topic', 'General')
+            indices = self.positions.get(topic)
+            if indices is None:
+                indices = self.positions[topic] = array('I')
+            indices.append(position)
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __contains__(self, topic):
+        return topic in self.positions
+
+    @property
+    def topics(self):
+        return list(self.positions)
+
+    def count(self, topic):
+        return len(self.positions.get(topic, ()))
+
+    def counts(self, topics=None):
+        """Question count per topic, for all topics or just the given ones"""
+        if topics is None:
+            return {topic: len(indices) for topic, indices in self.positions.items()}
+        return {topic: self.count(topic) for topic in topics}
+
+    def select(self, topics):
+        """Bank positions of the questions in the given topics, in bank order
+
+        Only the selected topics' postings are touched, so the cost depends on how
+        many questions are selected, not on the size of the bank.
+        """
+        selected = array('I')
+        for topic in dict.fromkeys(topics):
+            selected.extend(self.positions.get(topic, ()))
+        return array('I', sorted(selected))
+
+
+class TopicTaxonomy:
+    """Parent categories over a bank's free-text topics
+
+    A question's `category` field ("CV > Formatting") declares its topic's parents.
+    Otherwise parents come from explicit separators in the topic and from word
+    prefixes shared by two or more topics, so "CV Formatting" and "CV Writing"
+    both sit under "CV" and "Interview Assessment (Hard)" under "Interview Assessment".
+    """
+
+    __slots__ = ('paths', 'children', 'roots')
+
+    def __init__(self, bank):
+        declared = {}
+        for question in bank:
+            topic = question.get('topic', 'General')
+            if topic not in declared:
+                declared[topic] = None
+            category = question.get('category')
+            if category and declared[topic] is None:
+                declared[topic] = [part for part in TOPIC_SEPARATOR.split(category) if part]
+
+        heads = {topic: self._segments(topic)[0] for topic in declared}
+        prefix_counts = defaultdict(int)
+        for head in set(heads.values()):
+            for prefix in self._prefixes(head):
+                prefix_counts[prefix.casefold()] += 1
+
+        # topic -> tuple of node names from the root down to the topic itself
+        self.paths = {}
+        self.children = {}
+        self.roots = []
+        for topic, category in declared.items():
+            if category:
+                ancestors = category
+            else:
+                shared = [prefix for prefix in self._prefixes(heads[topic])
+                          if prefix_counts[prefix.casefold()] >= 2]
+                # A prefix covering exactly the same topics as the next longer one adds
+                # nothing ("Public" above "Public Speaking"), so skip it
+                ancestors = [prefix for prefix, longer in zip(shared, shared[1:] + [None])
+                             if longer is None or prefix_counts[prefix.casefold()] > prefix_counts[longer.casefold()]]
+                ancestors += self._segments(topic)[:-1]
+            path = list(dict.fromkeys(node for node in ancestors if node != topic)) + [topic]
+            self.paths[topic] = tuple(path)
+
+        # A qualified topic goes under the unqualified one when the bank has both
+        for topic, category in declared.items():
+            base = TOPIC_QUALIFIER.sub('', topic).strip()
+            if not category and base != topic and base in self.paths:
+                self.paths[topic] = self.paths[base] + (topic,)
+
+        for path in self.paths.values():
+            parent = None
+            for node in path:
+                siblings = self.roots if parent is None else self.children.setdefault(parent, [])
+                if node not in siblings:
+                    siblings.append(node)
+                parent = node
+
+    @staticmethod
+    def _segments(topic):
+        base = TOPIC_QUALIFIER.sub('', topic).strip() or topic
+        return [segment for segment in TOPIC_SEPARATOR.split(base) if segment] or [topic]
+
+    @staticmethod
+    def _prefixes(head):
+        words = head.split()
+        for length in range(1, len(words) + 1):
+            if length == 1 and words[0].casefold() in PREFIX_STOPWORDS:
+                continue
+            yield " ".join(words[:length])
+
+    def rollup(self, topic_counts):
+        """Roll per-topic numbers up to every category above them"""
+        totals = defaultdict(int)
+        for topic, count in topic_counts.items():
+            for node in self.path(topic):
+                totals[node] += count
+        return dict(totals)
+
+    def path(self, topic):
+        """Nodes from the root category down to the topic itself"""
+        return self.paths.get(topic, (topic,))
+
+    def walk(self, nodes=None, depth=0, ancestors=()):
+        """Yield (node, depth) for the taxonomy in display order"""
+        for node in self.roots if nodes is None else nodes:
+            # Conflicting declared categories could otherwise loop forever
+            if node in ancestors:
+                continue
+            yield node, depth
+            yield from self.walk(self.children.get(node, ()), depth + 1, ancestors + (node,))
+
+
+class SearchIndex:
+    """BM25 inverted index over each question's text, options and explanation
+
+    Each posting stores its term's precomputed BM25 contribution and postings are
+    sorted strongest first, so a query only adds up numbers. Only the first
+    SEARCH_POSTINGS_LIMIT postings of a term are read; terms that common have an
+    IDF near zero, so latency stays flat as the bank grows without changing the
+    top results.
+    """
+
+    __slots__ = ('postings', 'size')
+
+    def __init__(self, bank, k1=BM25_K1, b=BM25_B):
+        # term -> (bank positions, term frequencies) while building
+        collected = {}
+        lengths = array('I')
+        for position, question in enumerate(bank):
+            tokens = search_tokens(question_search_text(question))
+            lengths.append(len(tokens))
+            for term, frequency in Counter(tokens).items():
+                entry = collected.get(term)
+                if entry is None:
+                    entry = collected[term] = (array('I'), array('I'))
+                entry[0].append(position)
+                entry[1].append(frequency)
+
+        self.size = len(lengths)
+        average_length = sum(lengths) / self.size if self.size else 0.0
+        # term -> (bank positions, BM25 contributions), strongest first
+        self.postings = {}
+        for term, (positions, frequencies) in collected.items():
+            idf = math.log(1 + (self.size - len(positions) + 0.5) / (len(positions) + 0.5))
+            impacts = [idf * frequency * (k1 + 1) /
+                       (frequency + k1 * (1 - b + b * lengths[position] / average_length))
+                       for position, frequency in zip(positions, frequencies)]
+            ranked = sorted(range(len(positions)), key=impacts.__getitem__, reverse=True)
+            self.postings[term] = (array('I', [positions[i] for i in ranked]),
+                                   array('f', [impacts[i] for i in ranked]))
+
+    def __len__(self):
+        return self.size
+
+    def search(self, query, limit=10, accept=None):
+        """Return up to `limit` (bank position, score) pairs, best match first
+
+        `accept(position)`, if given, filters the results, e.g. to the topics of the exam.
+        """
+        scores = {}
+        get = scores.get
+        for term in dict.fromkeys(search_tokens(query)):
+            entry = self.postings.get(term)
+            if entry is None:
+                continue
+            positions, impacts = entry
+            for position, impact in islice(zip(positions, impacts), SEARCH_POSTINGS_LIMIT):
+                scores[position] = get(position, 0.0) + impact
+
+        if accept is None:
+            ranked = heapq.nlargest(limit, scores, key=scores.__getitem__)
+        else:
+            ranked = islice((position for position in sorted(scores, key=scores.__getitem__, reverse=True)
+                             if accept(position)), limit)
+        return [(position, scores[position]) for position in ranked]
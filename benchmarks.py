@@ -0,0 +1,286 @@
+"""Micro-benchmarks for the exam app's data layer
+
+Run with `python benchmarks.py`. Nothing here imports Streamlit, so the numbers
+measure only the bank and session code.
+"""
+import copy
+import io
+import json
+import os
+import pickle
+import random
+import tempfile
+import time
+import tracemalloc
+
+from bank_dedup import find_duplicate_clusters
+from bank_import import extract_questions_from_data, read_questions_from_stream, validate_bank
+from bank_index import SearchIndex
+from exam_state import ExamState
+from question_bank import BankRegistry, BankView, CompiledBank, compile_bank, create_bank_store
+
+
+def make_synthetic_bank(size, topics=50):
+    """Build a bank of `size` questions shaped like the built-in ones"""
+    return [
+        {
+            "id": i + 1,
+            "topic": f"Topic {i % topics}",
+            "question": f"Synthetic question number {i + 1} about topic {i % topics}?",
+            "options": {
+                "A": f"First option for question {i + 1}",
+                "B": f"Second option for question {i + 1}",
+                "C": f"Third option for question {i + 1}",
+                "D": f"Fourth option for question {i + 1}",
+            },
+            "correct_answer": "ABCD"[i % 4],
+            "explanation": f"Explanation for question {i + 1}, which is long enough to matter.",
+        }
+        for i in range(size)
+    ]
+
+
+def measure_peak(build):
+    """Return (result, bytes still allocated by build(), peak bytes allocated during it)"""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, after - before, peak - before
+
+
+def measure_allocated(build):
+    """Return (result, bytes still allocated by build())"""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return result, after - before
+
+
+def bench_session_memory(bank_size=2000, sessions=50):
+    """Per-session memory for private question copies vs. views over a shared bank"""
+    bank = make_synthetic_bank(bank_size)
+
+    _, copied = measure_allocated(lambda: [copy.deepcopy(bank) for _ in range(sessions)])
+
+    with tempfile.TemporaryDirectory() as directory:
+        registry = BankRegistry(create_bank_store(directory))
+        bank_hash = registry.register(bank)
+        shared = registry.get(bank_hash)
+        _, viewed = measure_allocated(lambda: [BankView(shared) for _ in range(sessions)])
+
+    print(f"Session memory ({bank_size} questions, {sessions} sessions)")
+    print(f"  private copies: {copied / sessions / 1024:10.1f} KiB per session")
+    print(f"  shared bank:    {viewed / sessions / 1024:10.1f} KiB per session")
+
+
+def bench_upload_memory(bank_size=50000):
+    """Memory to parse an uploaded bank and register it, streamed vs. json.loads"""
+    payload = json.dumps({"questions": make_synthetic_bank(bank_size)}).encode('utf-8')
+
+    loaded, loaded_kept, loaded_peak = measure_peak(lambda: extract_questions_from_data(json.loads(payload)))
+    del loaded
+    (questions, _), streamed_kept, streamed_peak = measure_peak(
+        lambda: read_questions_from_stream(io.BytesIO(payload)))
+
+    with tempfile.TemporaryDirectory() as directory:
+        registry = BankRegistry(create_bank_store(directory))
+        _, _, registered_peak = measure_peak(lambda: registry.register(questions))
+
+    mib = 1024 * 1024
+    print(f"Upload memory ({bank_size} questions, {len(payload) / mib:.1f} MiB of JSON)")
+    print(f"  json.loads: {loaded_kept / mib:8.1f} MiB kept, {loaded_peak / mib:8.1f} MiB peak")
+    print(f"  streamed:   {streamed_kept / mib:8.1f} MiB kept, {streamed_peak / mib:8.1f} MiB peak")
+    print(f"  register:   {registered_peak / mib:8.1f} MiB peak")
+
+
+def bench_file_bank_init(bank_size=20000, warm_runs=5):
+    """Cold vs. warm time to get a session's bank from a local JSON file"""
+    def extract(data):
+        return data.get("questions")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bank.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"questions": make_synthetic_bank(bank_size)}, f)
+        registry = BankRegistry(create_bank_store(os.path.join(directory, "banks")))
+
+        start = time.perf_counter()
+        registry.view(registry.register_file(path, extract))
+        cold = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(warm_runs):
+            registry.view(registry.register_file(path, extract))
+        warm = (time.perf_counter() - start) / warm_runs
+
+    print(f"File bank init ({bank_size} questions)")
+    print(f"  cold: {cold * 1000:10.2f} ms")
+    print(f"  warm: {warm * 1000:10.2f} ms")
+
+
+def bench_compiled_access(bank_size=100000, lookups=10000):
+    """Open time and random-access latency of a memory-mapped compiled bank"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bank.qbank")
+        compile_bank(make_synthetic_bank(bank_size), path)
+
+        start = time.perf_counter()
+        bank = CompiledBank(path)
+        opened = time.perf_counter() - start
+
+        indices = [random.randrange(bank_size) for _ in range(lookups)]
+        start = time.perf_counter()
+        for index in indices:
+            bank[index]
+        per_lookup = (time.perf_counter() - start) / lookups
+        bank.close()
+
+    print(f"Compiled bank ({bank_size} questions)")
+    print(f"  open:   {opened * 1000:10.3f} ms")
+    print(f"  lookup: {per_lookup * 1e6:10.2f} us")
+
+
+def bench_startup(runs=10):
+    """Compile time of the app module and first/repeat load of the built-in bank"""
+    app_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "streamlit_app.py")
+    builtin_path = os.path.join(os.path.dirname(app_path), "builtin_questions.json")
+    with open(app_path, 'r', encoding='utf-8') as f:
+        source = f.read()
+
+    start = time.perf_counter()
+    for _ in range(runs):
+        compile(source, app_path, 'exec')
+    compiled = (time.perf_counter() - start) / runs
+
+    with tempfile.TemporaryDirectory() as directory:
+        registry = BankRegistry(create_bank_store(directory))
+        start = time.perf_counter()
+        registry.view(registry.register_file(builtin_path, extract_questions_from_data))
+        cold = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(runs):
+            registry.view(registry.register_file(builtin_path, extract_questions_from_data))
+        warm = (time.perf_counter() - start) / runs
+
+    print("Startup")
+    print(f"  compile streamlit_app.py: {compiled * 1000:10.2f} ms")
+    print(f"  built-in bank, first use: {cold * 1000:10.2f} ms")
+    print(f"  built-in bank, cached:    {warm * 1000:10.2f} ms")
+
+
+def bench_validation(bank_size=100000):
+    """Throughput of full-bank validation"""
+    bank = make_synthetic_bank(bank_size)
+    # A few broken items so the error paths are exercised too
+    bank[bank_size // 2] = dict(bank[bank_size // 2], correct_answer="E")
+    bank[-1] = {"question": "No options"}
+
+    start = time.perf_counter()
+    issues = validate_bank(bank)
+    elapsed = time.perf_counter() - start
+
+    print(f"Validation ({bank_size} questions)")
+    print(f"  {elapsed * 1000:10.2f} ms, {bank_size / elapsed:,.0f} items/s, {len(issues)} issues")
+
+
+def bench_duplicates(bank_size=100000, copies=100):
+    """Time to cluster exact and near-duplicate questions"""
+    rng = random.Random(0)
+    words = ["".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(3, 9))) for _ in range(20000)]
+    bank = make_synthetic_bank(bank_size)
+    for question in bank:
+        question["question"] = " ".join(rng.choices(words, k=12)) + "?"
+    # Lightly edited copies that should come back as near-duplicates
+    for index in range(0, bank_size, bank_size // copies):
+        bank.append(dict(bank[index], question=bank[index]["question"].replace("?", " now?")))
+
+    start = time.perf_counter()
+    clusters = find_duplicate_clusters(bank)
+    elapsed = time.perf_counter() - start
+
+    print(f"Duplicate detection ({len(bank)} questions)")
+    print(f"  {elapsed * 1000:10.2f} ms, {len(clusters)} clusters")
+
+
+def bench_search(bank_size=100000, queries=200):
+    """Build time and query latency of the BM25 search index"""
+    rng = random.Random(0)
+    words = ["".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(3, 9))) for _ in range(20000)]
+    # Zipf-like word choice so some terms are rare and some appear in most questions
+    weights = [1 / (rank + 1) for rank in range(len(words))]
+    bank = make_synthetic_bank(bank_size)
+    for question in bank:
+        question["question"] = " ".join(rng.choices(words, weights, k=12)) + "?"
+        question["explanation"] = " ".join(rng.choices(words, weights, k=20)) + "."
+
+    start = time.perf_counter()
+    index = SearchIndex(bank)
+    built = time.perf_counter() - start
+
+    latencies = []
+    for _ in range(queries):
+        query = " ".join(rng.choices(words, weights, k=rng.randint(1, 4)))
+        start = time.perf_counter()
+        index.search(query)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+
+    print(f"Search ({bank_size} questions, {queries} queries)")
+    print(f"  build:  {built * 1000:10.2f} ms")
+    print(f"  median: {latencies[len(latencies) // 2] * 1000:10.3f} ms")
+    print(f"  p95:    {latencies[int(len(latencies) * 0.95)] * 1000:10.3f} ms")
+
+
+def bench_exam_state(exam_size=10000, runs=100):
+    """Save payload and status-query time of typed-array exam state vs. plain lists"""
+    rng = random.Random(0)
+    exam = ExamState(exam_size)
+    options = ("A", "B", "C", "D")
+    answers = [None] * exam_size
+    results = [None] * exam_size
+    for index in range(0, exam_size, 2):
+        # Mostly right, so wrong answers are the sparse set a review looks for
+        option = "A" if rng.random() < 0.98 else "B"
+        exam.answer(index, option, option == "A", options=options)
+        answers[index] = option
+        results[index] = option == "A"
+
+    plain = len(pickle.dumps({'user_answers': answers, 'results': results}))
+    packed = len(pickle.dumps(exam))
+
+    start = time.perf_counter()
+    for _ in range(runs):
+        [index for index, result in enumerate(results) if result is False]
+    scanned = (time.perf_counter() - start) / runs
+
+    start = time.perf_counter()
+    for _ in range(runs):
+        list(exam.positions(exam.mask('wrong')))
+    masked = (time.perf_counter() - start) / runs
+
+    print(f"Exam state ({exam_size} questions, half answered)")
+    print(f"  save payload, lists:  {plain / 1024:10.1f} KiB")
+    print(f"  save payload, arrays: {packed / 1024:10.1f} KiB")
+    print(f"  all wrong, list scan: {scanned * 1000:10.3f} ms")
+    print(f"  all wrong, bitsets:   {masked * 1000:10.3f} ms")
+
+
+if __name__ == "__main__":
+    bench_startup()
+    bench_session_memory()
+    bench_upload_memory()
+    bench_file_bank_init()
+    bench_compiled_access()
+    bench_validation()
+    bench_duplicates()
+    bench_search()
+    bench_exam_state()
@@ -0,0 +1,32 @@
+"""Optional browser-side answering for the exam
+
+The component receives a window of questions with their answers and explanations,
+grades and reveals answers in the page without a server round trip, and sends the
+graded answers back in batches, so the script reruns once per batch instead of
+twice per question.
+"""
+import os
+
+import streamlit.components.v1 as components
+
+# Questions sent to the browser at a time
+CLIENT_WINDOW_SIZE = 20
+
+# Answers the browser collects before syncing them back in one rerun
+CLIENT_SYNC_BATCH = 5
+
+_FRONTEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "client_answers_frontend")
+_component = components.declare_component("client_answers", path=_FRONTEND_DIR)
+
+
+def client_answers(questions, start, total, batch_size=CLIENT_SYNC_BATCH, key=None):
+    """Render a window of questions that are answered in the browser
+
+    `questions` are plain dicts with index, topic, question, options (a list of
+    [label, shown label, text] in display order), correct_answer, explanation and
+    the current answer. Returns the browser's latest batch, {id, answers, position,
+    finish}, or None before the first sync; the same batch is returned on every
+    rerun until a new one arrives, so callers apply each id only once.
+    """
+    return _component(questions=questions, start=start, total=total, batch_size=batch_size,
+                      key=key, default=None)
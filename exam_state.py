@@ -0,0 +1,251 @@
+"""One session's progress through an exam, independent of Streamlit
+
+Answered, correct and per-category totals are updated on every change instead of
+being recounted from the answers, so showing progress costs the same whatever
+the length of the exam.
+
+Answers are stored as one byte per question, the position of the chosen option
+among that question's own options, and answered/correct/flagged status
+as bitsets, so a session costs under two bytes per question and the next question
+with a given status is found with integer bit operations instead of a Python loop.
+"""
+
+# Answers are stored as the 1-based position of the option in its question's
+# options, so a question can have up to 255 options; 0 means unanswered
+MAX_OPTION_CODES = 255
+
+# Question status codes returned by ExamState.statuses
+STATUS_UNANSWERED = 0
+STATUS_CORRECT = 1
+STATUS_WRONG = 2
+STATUS_FLAGGED = 4  # added to one of the above
+
+
+def _bitset(size):
+    return bytearray((size + 7) // 8)
+
+
+def _get_bit(bits, index):
+    return bits[index >> 3] >> (index & 7) & 1
+
+
+def _set_bit(bits, index, value):
+    if value:
+        bits[index >> 3] |= 1 << (index & 7)
+    else:
+        bits[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+
+
+def _permute_bits(bits, old_positions):
+    permuted = _bitset(len(old_positions))
+    for index, old in enumerate(old_positions):
+        if bits[old >> 3] >> (old & 7) & 1:
+            permuted[index >> 3] |= 1 << (index & 7)
+    return permuted
+
+
+class ExamState:
+    """Answers, position and running totals of one exam
+
+    `topic_progress` maps each taxonomy node to [answered, correct].
+    """
+
+    __slots__ = ('answers', 'answered_bits', 'correct_bits', 'flagged_bits',
+                 'current_question', 'answered', 'exam_completed',
+                 'answered_count', 'score', 'flagged_count', 'topic_progress')
+
+    def __init__(self, size):
+        # One option code per question, indexing that question's options from 1
+        self.answers = bytearray(size)
+        self.answered_bits = _bitset(size)
+        self.correct_bits = _bitset(size)
+        self.flagged_bits = _bitset(size)
+        self.current_question = 0
+        # Whether the current question's result is being shown
+        self.answered = False
+        self.exam_completed = False
+        self.answered_count = 0
+        self.score = 0
+        self.flagged_count = 0
+        self.topic_progress = {}
+
+    def __len__(self):
+        return len(self.answers)
+
+    @property
+    def accuracy(self):
+        """Share of the answered questions that were answered correctly"""
+        return self.score / self.answered_count if self.answered_count else 0.0
+
+    def answer_of(self, index, options):
+        """The option chosen for a question, or None if it is unanswered
+
+        `options` are the question's options (or their labels) in bank order.
+        """
+        code = self.answers[index]
+        if not code:
+            return None
+        labels = list(options)
+        return labels[code - 1] if code <= len(labels) else None
+
+    def result_of(self, index):
+        """None if a question is unanswered, else whether its answer was correct"""
+        if not _get_bit(self.answered_bits, index):
+            return None
+        return bool(_get_bit(self.correct_bits, index))
+
+    def is_flagged(self, index):
+        return bool(_get_bit(self.flagged_bits, index))
+
+    def statuses(self, indices):
+        """Status code of each question in `indices`, read straight from the bitsets"""
+        answered_bits, correct_bits, flagged_bits = self.answered_bits, self.correct_bits, self.flagged_bits
+        codes = bytearray(len(indices))
+        for offset, index in enumerate(indices):
+            if _get_bit(answered_bits, index):
+                codes[offset] = STATUS_CORRECT if _get_bit(correct_bits, index) else STATUS_WRONG
+            if _get_bit(flagged_bits, index):
+                codes[offset] |= STATUS_FLAGGED
+        return codes
+
+    @staticmethod
+    def _option_code(option, options):
+        for code, label in enumerate(options, 1):
+            if label == option:
+                if code > MAX_OPTION_CODES:
+                    raise ValueError(f"Option {option!r} is beyond the first {MAX_OPTION_CODES} options")
+                return code
+        raise ValueError(f"{option!r} is not one of the question's options")
+
+    def answer(self, index, option, is_correct, path=(), *, options):
+        """Record an answer, replacing any earlier answer to the same question
+
+        `path` lists the taxonomy nodes of the question's topic, root first, and
+        `options` are the question's options in bank order. Raises ValueError if
+        `option` is not one of them.
+        """
+        code = self._option_code(option, options)
+        was_correct = self.result_of(index)
+        answered_delta = 0 if was_correct is not None else 1
+        correct_delta = int(bool(is_correct)) - int(bool(was_correct))
+        self.answers[index] = code
+        _set_bit(self.answered_bits, index, True)
+        _set_bit(self.correct_bits, index, is_correct)
+        self.answered_count += answered_delta
+        self.score += correct_delta
+        for node in path:
+            counters = self.topic_progress.setdefault(node, [0, 0])
+            counters[0] += answered_delta
+            counters[1] += correct_delta
+        self.current_question = index
+        self.answered = True
+
+    def recount_topics(self, path_of):
+        """Rebuild topic_progress from the recorded answers, e.g. for a new taxonomy
+
+        `path_of(index)` gives the taxonomy path of the question at a position.
+        """
+        progress = {}
+        for index in self.positions(self.mask('answered')):
+            correct = _get_bit(self.correct_bits, index)
+            for node in path_of(index):
+                counters = progress.setdefault(node, [0, 0])
+                counters[0] += 1
+                counters[1] += correct
+        self.topic_progress = progress
+
+    def flag(self, index, flagged=True):
+        """Mark or unmark a question for review"""
+        if self.is_flagged(index) != bool(flagged):
+            _set_bit(self.flagged_bits, index, flagged)
+            self.flagged_count += 1 if flagged else -1
+
+    def goto(self, index):
+        self.current_question = index
+        self.answered = False
+
+    def retry(self):
+        """Answer the current question again; the earlier answer counts until it is replaced"""
+        self.answered = False
+
+    def finish(self):
+        self.exam_completed = True
+
+    def reset(self):
+        self.__init__(len(self))
+
+    def permute(self, old_positions):
+        """Move every answer and flag with its question after the exam is reordered
+
+        `old_positions[i]` is the position before reordering of the question now at i.
+        The totals don't change, so only the per-question arrays are rebuilt.
+        """
+        self.answers = bytearray(map(self.answers.__getitem__, old_positions))
+        self.answered_bits = _permute_bits(self.answered_bits, old_positions)
+        self.correct_bits = _permute_bits(self.correct_bits, old_positions)
+        self.flagged_bits = _permute_bits(self.flagged_bits, old_positions)
+        self.goto(0)
+
+    def mask(self, status):
+        """Bitmask with bit i set for every question with the status:
+        'answered', 'unanswered', 'correct', 'wrong' or 'flagged'"""
+        answered = int.from_bytes(self.answered_bits, 'little')
+        if status == 'answered':
+            return answered
+        if status == 'unanswered':
+            return ~answered & ((1 << len(self)) - 1)
+        correct = int.from_bytes(self.correct_bits, 'little')
+        if status == 'correct':
+            return correct
+        if status == 'wrong':
+            return answered & ~correct
+        if status == 'flagged':
+            return int.from_bytes(self.flagged_bits, 'little')
+        raise ValueError(f"Unknown question status: {status!r}")
+
+    @staticmethod
+    def positions(mask):
+        """Indices of the set bits of a mask, in order"""
+        # Searching the binary digits runs in C; peeling off bits one by one would
+        # cost a big-integer operation per question
+        digits = bin(mask)[:1:-1]
+        index = digits.find('1')
+        while index != -1:
+            yield index
+            index = digits.find('1', index + 1)
+
+    def next_position(self, mask, after=None):
+        """First question in the mask after `after` (default: the current one), wrapping around"""
+        if not mask:
+            return None
+        start = self.current_question if after is None else after
+        later = mask >> (start + 1)
+        if later:
+            return start + 1 + (later & -later).bit_length() - 1
+        return (mask & -mask).bit_length() - 1
+
+    def apply(self, event, path_of=None, options_of=None):
+        """Apply one session journal event
+
+        `path_of(index)` returns the taxonomy path of the question at that exam
+        position, so replayed answers update the per-category totals too, and
+        `options_of(index)` its options, which answer events need. An answer that
+        isn't one of its question's options is skipped rather than failing a replay.
+        """
+        kind = event[0]
+        if kind == 'answer':
+            _, index, option, correct = event
+            options = options_of(index)
+            if option in options:
+                self.answer(index, option, correct, path_of(index) if path_of else (), options=options)
+        elif kind == 'goto':
+            self.goto(event[1])
+        elif kind == 'retry':
+            self.retry()
+        elif kind == 'flag':
+            self.flag(event[1], event[2])
+        elif kind == 'finish':
+            self.finish()
+        elif kind == 'reset':
+            self.reset()
+        return self
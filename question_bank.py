@@ -0,0 +1,503 @@
+"""Content-addressed storage for question banks
+
+Banks are stored once under the SHA-256 of their canonical JSON, so sessions only
+need to remember the hash of the bank they are using. Each process keeps one frozen
+copy of every bank in use, shared by all sessions through a BankView.
+
+Large banks are also compiled to an indexed binary file (see compile_bank) that
+is memory-mapped, so only the questions actually shown are ever decoded.
+"""
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import random
+import re
+import struct
+import sys
+import tempfile
+import threading
+from array import array
+from collections import OrderedDict
+from types import MappingProxyType
+
+from bank_import import validate_bank
+
+BANK_HASH_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+# Banks with at least this many questions are served from a compiled, memory-mapped file
+COMPILED_BANK_THRESHOLD = int(os.environ.get("EXAM_COMPILED_BANK_THRESHOLD", "10000"))
+
+# Banks a registry keeps in memory, with their indexes; the least recently used is
+# dropped first and reloaded from the store if it is needed again
+BANK_CACHE_SIZE = int(os.environ.get("EXAM_BANK_CACHE_SIZE", "32"))
+
+# Upload hashes a registry remembers so re-uploads skip parsing
+UPLOAD_CACHE_SIZE = 1024
+
+# Compiled bank layout: header, one compact JSON record per question, then a table of
+# count + 1 record offsets so record i spans offsets[i]:offsets[i + 1]
+COMPILED_BANK_MAGIC = b"QBNK"
+COMPILED_BANK_VERSION = 1
+COMPILED_BANK_HEADER = struct.Struct("<4sIQQ")  # magic, version, count, offset table position
+COMPILED_BANK_OFFSET = struct.Struct("<Q")
+
+
+def _plain_mapping(value):
+    if isinstance(value, MappingProxyType):
+        return dict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def canonical_bank_json(questions):
+    """Serialize a bank to JSON deterministically so equal banks hash equally
+
+    Frozen banks serialize like the plain JSON they were made from.
+    """
+    return json.dumps(questions, sort_keys=True, separators=(',', ':'), ensure_ascii=False,
+                      default=_plain_mapping)
+
+
+def iter_canonical_bank_json(questions):
+    """Yield canonical_bank_json(questions) encoded as UTF-8, one question at a time,
+    so a large bank is never serialized as a whole"""
+    separator = b'['
+    for question in questions:
+        yield separator
+        yield canonical_bank_json(question).encode('utf-8')
+        separator = b','
+    yield b']' if separator == b',' else b'[]'
+
+
+def compute_bank_hash(questions):
+    """Return the content hash of a question bank"""
+    digest = hashlib.sha256()
+    for chunk in iter_canonical_bank_json(questions):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _atomic_write(path, write):
+    """Call write(f) on a temp file next to path, then rename it into place"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def compile_bank(questions, path):
+    """Write questions (any iterable) to a compiled bank file and return the count"""
+    count = 0
+
+    def write(f):
+        nonlocal count
+        f.write(COMPILED_BANK_HEADER.pack(COMPILED_BANK_MAGIC, COMPILED_BANK_VERSION, 0, 0))
+        offsets = [f.tell()]
+        for question in questions:
+            f.write(json.dumps(question, separators=(',', ':'), ensure_ascii=False,
+                               default=_plain_mapping).encode('utf-8'))
+            offsets.append(f.tell())
+        table_position = f.tell()
+        for offset in offsets:
+            f.write(COMPILED_BANK_OFFSET.pack(offset))
+        f.seek(0)
+        f.write(COMPILED_BANK_HEADER.pack(COMPILED_BANK_MAGIC, COMPILED_BANK_VERSION,
+                                          len(offsets) - 1, table_position))
+        count = len(offsets) - 1
+
+    _atomic_write(path, write)
+    return count
+
+
+class CompiledBank:
+    """Read-only, memory-mapped view of a compiled bank with random access by index
+
+    Only the header is read up front; each question is decoded when it is accessed.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self._count, self._table = COMPILED_BANK_HEADER.unpack_from(self._mmap, 0)
+        if magic != COMPILED_BANK_MAGIC or version != COMPILED_BANK_VERSION:
+            self._mmap.close()
+            raise ValueError(f"Not a compiled question bank: {path}")
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("question index out of range")
+        position = self._table + index * COMPILED_BANK_OFFSET.size
+        start, = COMPILED_BANK_OFFSET.unpack_from(self._mmap, position)
+        end, = COMPILED_BANK_OFFSET.unpack_from(self._mmap, position + COMPILED_BANK_OFFSET.size)
+        return freeze_owned_value(json.loads(self._mmap[start:end]))
+
+    def __iter__(self):
+        return (self[i] for i in range(self._count))
+
+    def close(self):
+        self._mmap.close()
+
+
+class BankStore:
+    """Stores question banks as <hash>.json files in a local directory, plus
+    <hash>.qbank compiled copies of large banks"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def _path(self, bank_hash, extension=".json"):
+        if not BANK_HASH_PATTERN.match(bank_hash or ""):
+            raise ValueError(f"Invalid bank hash: {bank_hash!r}")
+        return os.path.join(self.directory, f"{bank_hash}{extension}")
+
+    def put(self, questions, compiled=False):
+        """Store a bank if it isn't stored yet and return its hash
+
+        `questions` may be any iterable. The bank is hashed and written in the same
+        pass, one question at a time, to temp files that are renamed to its hash at
+        the end. With `compiled`, the compiled copy is written in that pass too, so a
+        bank streamed from a file is never held in memory as a whole.
+        """
+        digest = hashlib.sha256()
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        compiled_tmp_path = tmp_path[:-len(".tmp")] + ".qbank.tmp"
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                def written(questions):
+                    separator = b'['
+                    for question in questions:
+                        chunk = separator + canonical_bank_json(question).encode('utf-8')
+                        digest.update(chunk)
+                        f.write(chunk)
+                        separator = b','
+                        yield question
+                    end = b']' if separator == b',' else b'[]'
+                    digest.update(end)
+                    f.write(end)
+
+                if compiled:
+                    compile_bank(written(questions), compiled_tmp_path)
+                else:
+                    for _ in written(questions):
+                        pass
+            bank_hash = digest.hexdigest()
+            with self._lock:
+                if not os.path.exists(self._path(bank_hash)):
+                    os.replace(tmp_path, self._path(bank_hash))
+                if compiled and not os.path.exists(self._path(bank_hash, ".qbank")):
+                    os.replace(compiled_tmp_path, self._path(bank_hash, ".qbank"))
+        finally:
+            for leftover in (tmp_path, compiled_tmp_path):
+                if os.path.exists(leftover):
+                    os.remove(leftover)
+        return bank_hash
+
+    def get_compiled(self, bank_hash):
+        """Return the memory-mapped compiled copy of a bank, or None if there isn't one"""
+        try:
+            return CompiledBank(self._path(bank_hash, ".qbank"))
+        except FileNotFoundError:
+            return None
+
+    def get(self, bank_hash):
+        """Return the bank stored under the hash, or None if it isn't stored"""
+        try:
+            with open(self._path(bank_hash), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def __contains__(self, bank_hash):
+        return os.path.exists(self._path(bank_hash))
+
+
+def create_bank_store(directory=None):
+    """Create the bank store in EXAM_BANK_DIR (default "question_banks")"""
+    return BankStore(directory or os.environ.get("EXAM_BANK_DIR", "question_banks"))
+
+
+def freeze_value(value):
+    """Return a read-only copy of a JSON value: dicts become mapping proxies, lists tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze_value(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze_value(item) for item in value)
+    return value
+
+
+def freeze_owned_value(value):
+    """Like freeze_value, but wraps dicts in place instead of copying them
+
+    For values nobody else holds, such as freshly parsed JSON, so freezing a large
+    bank doesn't briefly need memory for two copies of it. The caller must not
+    modify the dicts afterwards.
+    """
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if isinstance(item, (dict, list, tuple)):
+                value[key] = freeze_owned_value(item)
+        return MappingProxyType(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze_owned_value(item) for item in value)
+    return value
+
+
+def thaw_value(value):
+    """Return a plain, mutable JSON copy of a frozen value"""
+    if isinstance(value, MappingProxyType):
+        return {key: thaw_value(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw_value(item) for item in value]
+    return value
+
+
+class BankRegistry:
+    """Process-wide cache of frozen banks keyed by content hash
+
+    At most `cache_size` banks are held at once, least recently used out first.
+    Sessions keep their own reference to the bank they use, so evicting one only
+    stops new views from sharing it until it is loaded again.
+    """
+
+    def __init__(self, store, cache_size=BANK_CACHE_SIZE):
+        self.store = store
+        self.cache_size = cache_size
+        # bank hash -> frozen bank, least recently used first
+        self._banks = OrderedDict()
+        # realpath -> (mtime_ns, size, bank hash, validation issues) for banks loaded from files
+        self._files = {}
+        # SHA-256 of uploaded bytes -> bank hash, so re-uploads skip parsing
+        self._uploads = OrderedDict()
+        # bank hash -> name -> indexes and other data built from the bank
+        self._derived = {}
+        self._lock = threading.Lock()
+
+    def _cache(self, bank_hash, bank):
+        """Keep a bank in memory, evicting the least recently used ones; call with the lock held"""
+        bank = self._banks.setdefault(bank_hash, bank)
+        self._banks.move_to_end(bank_hash)
+        while len(self._banks) > self.cache_size:
+            evicted, _ = self._banks.popitem(last=False)
+            self._derived.pop(evicted, None)
+        return bank
+
+    def register(self, questions):
+        """Store the bank, keep one frozen copy in memory and return its hash
+
+        The registry takes over the question dicts, which are frozen in place rather
+        than copied, so callers must not modify them afterwards. Large banks are
+        compiled and memory-mapped instead of being kept in memory.
+        """
+        compiled = len(questions) >= COMPILED_BANK_THRESHOLD
+        bank_hash = self.store.put(questions, compiled=compiled)
+        with self._lock:
+            registered = bank_hash in self._banks
+        if not registered:
+            if compiled:
+                bank = self.store.get_compiled(bank_hash)
+            else:
+                bank = freeze_owned_value(questions)
+            with self._lock:
+                self._cache(bank_hash, bank)
+        return bank_hash
+
+    def get(self, bank_hash):
+        """Return the frozen bank for the hash, loading it from the store on first use"""
+        with self._lock:
+            bank = self._banks.get(bank_hash)
+            if bank is not None:
+                self._banks.move_to_end(bank_hash)
+        if bank is not None:
+            return bank
+        bank = self.store.get_compiled(bank_hash)
+        if bank is None:
+            questions = self.store.get(bank_hash)
+            if questions is None:
+                return None
+            bank = freeze_owned_value(questions)
+        with self._lock:
+            return self._cache(bank_hash, bank)
+
+    def register_file(self, path, extract):
+        """Register the bank in a JSON file, parsing it again only when its mtime or size changes
+
+        `extract` turns the parsed JSON into a question list, or None if it has none.
+        Questions that fail validation are left out; file_issues lists why.
+        Returns the bank hash, or None when the file holds no usable questions.
+        """
+        realpath = os.path.realpath(path)
+        stat = os.stat(realpath)
+        with self._lock:
+            cached = self._files.get(realpath)
+        if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            bank_hash = cached[2]
+            if bank_hash is None or self.get(bank_hash) is not None:
+                return bank_hash
+        with open(realpath, 'r', encoding='utf-8') as f:
+            questions = extract(json.load(f))
+        issues = validate_bank(questions) if questions else []
+        if issues:
+            unusable = {issue.index for issue in issues if issue.severity == 'error'}
+            questions = [question for index, question in enumerate(questions) if index not in unusable]
+        bank_hash = self.register(questions) if questions else None
+        with self._lock:
+            self._files[realpath] = (stat.st_mtime_ns, stat.st_size, bank_hash, issues)
+        return bank_hash
+
+    def file_issues(self, path):
+        """Return the validation issues found when the file was last registered"""
+        with self._lock:
+            cached = self._files.get(os.path.realpath(path))
+        return cached[3] if cached else []
+
+    def derived(self, bank_hash, name, build):
+        """Return data built from a bank by build(bank), building it once while the bank is cached"""
+        with self._lock:
+            value = self._derived.get(bank_hash, {}).get(name)
+            if value is not None:
+                self._banks.move_to_end(bank_hash)
+        if value is None:
+            bank = self.get(bank_hash)
+            if bank is None:
+                return None
+            value = build(bank)
+            with self._lock:
+                # Don't hold on to data for a bank evicted while it was being built
+                if bank_hash in self._banks:
+                    value = self._derived.setdefault(bank_hash, {}).setdefault(name, value)
+        return value
+
+    def bank_for_upload(self, upload_hash):
+        """Return the bank hash an upload with this content hash produced, if any"""
+        with self._lock:
+            bank_hash = self._uploads.get(upload_hash)
+            if bank_hash is not None:
+                self._uploads.move_to_end(upload_hash)
+            return bank_hash
+
+    def record_upload(self, upload_hash, bank_hash):
+        """Remember which bank an upload's content produced"""
+        with self._lock:
+            self._uploads[upload_hash] = bank_hash
+            self._uploads.move_to_end(upload_hash)
+            while len(self._uploads) > UPLOAD_CACHE_SIZE:
+                self._uploads.popitem(last=False)
+
+    def view(self, bank_hash, order=None):
+        """Return a BankView over the registered bank, or None if it is unknown"""
+        bank = self.get(bank_hash)
+        if bank is None:
+            return None
+        return BankView(bank, order, bank_hash)
+
+
+def seeded_permutation(size, seed):
+    """Return a random permutation of range(size) that the same seed always reproduces"""
+    permutation = array('I', range(size))
+    random.Random(seed).shuffle(permutation)
+    return permutation
+
+
+class BankView:
+    """One session's ordering over a shared frozen bank
+
+    The view holds only the question order as an array of indices, so a session
+    costs a few bytes per question no matter how large the questions are.
+    """
+
+    __slots__ = ('bank', 'order', 'bank_hash')
+
+    def __init__(self, bank, order=None, bank_hash=None):
+        self.bank = bank
+        self.bank_hash = bank_hash
+        self.order = array('I', range(len(bank))) if order is None else array('I', order)
+
+    def __len__(self):
+        return len(self.order)
+
+    def __getitem__(self, index):
+        return self.bank[self.order[index]]
+
+    def __iter__(self):
+        bank = self.bank
+        return (bank[i] for i in self.order)
+
+    def shuffle(self, seed):
+        """Reorder the view's questions by a seeded permutation and return where each came from
+
+        The permutation is applied to the questions in bank order, so a seed gives the
+        same order whatever order the view was in. Returns the old position of the
+        question at each new position.
+        """
+        base = sorted(self.order)
+        order = array('I', [base[i] for i in seeded_permutation(len(base), seed)])
+        old_positions = {position: index for index, position in enumerate(self.order)}
+        self.order = order
+        return array('I', [old_positions[position] for position in order])
+
+
+def main(argv=None):
+    """Command line entry point: validate a bank file and add it to the bank store compiled"""
+    from bank_import import BANK_READERS, BankParseError, BankValidator, detect_bank_format
+
+    parser = argparse.ArgumentParser(
+        description="Validate a question bank and add it to the bank store, compiled for memory-mapped access")
+    parser.add_argument("source", help="question bank file (.json, .ndjson or .csv)")
+    parser.add_argument("--store", help="bank store directory (default: EXAM_BANK_DIR or question_banks)")
+    args = parser.parse_args(argv)
+
+    bank_format = detect_bank_format(args.source)
+    reader = BANK_READERS[bank_format]
+    store = create_bank_store(args.store)
+
+    count = 0
+
+    def valid_questions(text_stream, validator):
+        nonlocal count
+        count = 0
+        for index, item in enumerate(reader(text_stream)):
+            if validator.check(item, index):
+                count += 1
+                yield item
+
+    # Stream the source so even very large banks are stored in constant memory
+    for encoding in ('utf-8-sig', 'latin-1'):
+        validator = BankValidator()
+        try:
+            with open(args.source, 'r', encoding=encoding,
+                      newline='' if bank_format == 'csv' else None) as f:
+                bank_hash = store.put(valid_questions(f, validator), compiled=True)
+            break
+        except UnicodeDecodeError:
+            continue
+        except BankParseError as e:
+            print(f"Error: {args.source}: {e}")
+            return 1
+
+    for issue in validator.issues:
+        field = f" {issue.field}" if issue.field else ""
+        print(f"{issue.severity.capitalize()}: item {issue.index + 1}{field}: {issue.message}")
+    if count == 0:
+        print(f"Error: {args.source} has no usable questions")
+        return 1
+    print(f"Stored {count} questions as {bank_hash}")
+    print(f"Open the app with ?bank={bank_hash} to use this bank")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,536 @@
+"""Pluggable session stores for persisting exam progress per browser session
+
+Each session is stored as a snapshot plus an append-only journal of small events
+recorded since that snapshot. Saving a snapshot compacts the journal away.
+"""
+import atexit
+import glob
+import json
+import os
+import pickle
+import re
+import secrets
+import sqlite3
+import tempfile
+import threading
+import time
+
+# Sessions older than this are treated as expired
+SESSION_MAX_AGE = 24 * 3600
+
+# Delete expired sessions at most this often, so the store doesn't grow with every token ever issued
+SESSION_PURGE_INTERVAL = 3600
+
+# Compact the journal into a fresh snapshot after this many events
+JOURNAL_COMPACT_EVERY = 50
+
+# Resume tokens are URL-safe so they can live in the query string
+SESSION_KEY_PATTERN = re.compile(r"^[A-Za-z0-9_-]{8,64}$")
+
+
+def new_session_key():
+    """Generate a fresh, unguessable resume token"""
+    return secrets.token_urlsafe(16)
+
+
+def is_valid_session_key(key):
+    """Check that a resume token has the expected shape"""
+    return isinstance(key, str) and bool(SESSION_KEY_PATTERN.match(key))
+
+
+def encode_event(event):
+    """Encode a journal event as compact JSON text"""
+    return json.dumps(event, separators=(',', ':'))
+
+
+def decode_event(text):
+    """Decode a journal event written by encode_event"""
+    return json.loads(text)
+
+
+class SessionStore:
+    """Base class for session stores keyed by a per-session resume token"""
+
+    def __init__(self, max_age=SESSION_MAX_AGE):
+        self.max_age = max_age
+
+    def save(self, key, data):
+        """Persist a snapshot of the session data and discard the journal before it"""
+        self.save_blob(key, pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def save_blob(self, key, blob):
+        """Persist an already pickled snapshot"""
+        raise NotImplementedError
+
+    def append_event(self, key, event):
+        """Append an event to the session journal and return the journal length"""
+        raise NotImplementedError
+
+    def load(self, key):
+        """Return (snapshot, events) for the key, or None if missing or expired"""
+        raise NotImplementedError
+
+    def delete(self, key):
+        """Remove any saved data for the key"""
+        raise NotImplementedError
+
+    def purge_expired(self):
+        """Delete every session whose last snapshot and events are older than max_age"""
+        raise NotImplementedError
+
+    def flush(self, key=None):
+        """Write any buffered changes for one session, or for all of them"""
+
+    def close(self):
+        """Release any resources held by the store"""
+
+    def _is_expired(self, saved_at):
+        return time.time() - saved_at >= self.max_age
+
+
+class MemorySessionStore(SessionStore):
+    """Keeps sessions in process memory; progress is lost when the server restarts"""
+
+    def __init__(self, max_age=SESSION_MAX_AGE):
+        super().__init__(max_age)
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self._purged_at = time.time()
+
+    def save_blob(self, key, blob):
+        # Keep the pickled copy so later mutations of the live state don't leak in
+        with self._lock:
+            self._sessions[key] = [time.time(), blob, []]
+        if time.time() - self._purged_at >= SESSION_PURGE_INTERVAL:
+            self.purge_expired()
+
+    def append_event(self, key, event):
+        text = encode_event(event)
+        with self._lock:
+            entry = self._sessions.get(key)
+            if entry is None:
+                return 0
+            entry[0] = time.time()
+            entry[2].append(text)
+            return len(entry[2])
+
+    def load(self, key):
+        with self._lock:
+            entry = self._sessions.get(key)
+            if entry is None:
+                return None
+            saved_at, blob, events = entry[0], entry[1], list(entry[2])
+        if self._is_expired(saved_at):
+            self.delete(key)
+            return None
+        return pickle.loads(blob), [decode_event(text) for text in events]
+
+    def delete(self, key):
+        with self._lock:
+            self._sessions.pop(key, None)
+
+    def purge_expired(self):
+        cutoff = time.time() - self.max_age
+        with self._lock:
+            self._purged_at = time.time()
+            for key in [key for key, entry in self._sessions.items() if entry[0] < cutoff]:
+                del self._sessions[key]
+
+
+class SQLiteSessionStore(SessionStore):
+    """Stores sessions in a SQLite database in WAL mode so many users can save concurrently"""
+
+    def __init__(self, path, max_age=SESSION_MAX_AGE):
+        super().__init__(max_age)
+        self.path = path
+        # Streamlit runs every session on its own thread, so each thread gets its own connection
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                " key TEXT PRIMARY KEY,"
+                " data BLOB NOT NULL,"
+                " updated_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS session_events ("
+                " seq INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " key TEXT NOT NULL,"
+                " event TEXT NOT NULL,"
+                " created_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS session_events_key ON session_events (key, seq)")
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def save_blob(self, key, blob):
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT INTO sessions (key, data, updated_at) VALUES (?, ?, ?)"
+                " ON CONFLICT(key) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at",
+                (key, blob, time.time()),
+            )
+            conn.execute("DELETE FROM session_events WHERE key = ?", (key,))
+
+    def append_event(self, key, event):
+        conn = self._connect()
+        with conn:
+            # Events only make sense on top of a snapshot
+            inserted = conn.execute(
+                "INSERT INTO session_events (key, event, created_at)"
+                " SELECT ?, ?, ? WHERE EXISTS (SELECT 1 FROM sessions WHERE key = ?)",
+                (key, encode_event(event), time.time(), key),
+            ).rowcount
+            if not inserted:
+                return 0
+            return conn.execute("SELECT COUNT(*) FROM session_events WHERE key = ?", (key,)).fetchone()[0]
+
+    def load(self, key):
+        conn = self._connect()
+        # Read the snapshot and its journal tail in one transaction so they stay consistent
+        with conn:
+            conn.execute("BEGIN")
+            row = conn.execute(
+                "SELECT data, updated_at FROM sessions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            events = conn.execute(
+                "SELECT event, created_at FROM session_events WHERE key = ? ORDER BY seq", (key,)
+            ).fetchall()
+        blob, saved_at = row
+        if events:
+            saved_at = max(saved_at, events[-1][1])
+        if self._is_expired(saved_at):
+            self.delete(key)
+            return None
+        return pickle.loads(blob), [decode_event(text) for text, _ in events]
+
+    def delete(self, key):
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM sessions WHERE key = ?", (key,))
+            conn.execute("DELETE FROM session_events WHERE key = ?", (key,))
+
+    def purge_expired(self):
+        """Delete every session whose last snapshot and events are older than max_age"""
+        cutoff = time.time() - self.max_age
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "DELETE FROM sessions WHERE updated_at < ? AND NOT EXISTS ("
+                " SELECT 1 FROM session_events e WHERE e.key = sessions.key AND e.created_at >= ?)",
+                (cutoff, cutoff),
+            )
+            conn.execute(
+                "DELETE FROM session_events WHERE key NOT IN (SELECT key FROM sessions)"
+            )
+
+    def close(self):
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+
+class FileSessionStore(SessionStore):
+    """Stores each session as a snapshot file plus a line-per-event journal file
+
+    Snapshots are written to a temp file and renamed into place, so a crash mid-write
+    never leaves a truncated snapshot behind. Every snapshot starts a new journal
+    generation, which keeps stale events from being replayed on top of it.
+    """
+
+    def __init__(self, directory, max_age=SESSION_MAX_AGE):
+        super().__init__(max_age)
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._generations = {}
+        self._journal_lengths = {}
+        self._lock = threading.Lock()
+
+    def _snapshot_path(self, key):
+        if not is_valid_session_key(key):
+            raise ValueError(f"Invalid session key: {key!r}")
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def _journal_path(self, key, generation):
+        return os.path.join(self.directory, f"{key}.{generation}.journal")
+
+    def _read_snapshot(self, key):
+        path = self._snapshot_path(key)
+        try:
+            with open(path, 'rb') as f:
+                generation, blob = pickle.load(f)
+            saved_at = os.path.getmtime(path)
+        except FileNotFoundError:
+            return None
+        return generation, blob, saved_at
+
+    def save_blob(self, key, blob):
+        path = self._snapshot_path(key)
+        generation = time.time_ns()
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=f".{key}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump((generation, blob), f, protocol=pickle.HIGHEST_PROTOCOL)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        with self._lock:
+            self._generations[key] = generation
+            self._journal_lengths[key] = 0
+        # Journals from earlier generations are now covered by the snapshot
+        for old_journal in glob.glob(os.path.join(self.directory, f"{key}.*.journal")):
+            if old_journal != self._journal_path(key, generation):
+                os.remove(old_journal)
+
+    def append_event(self, key, event):
+        with self._lock:
+            generation = self._generations.get(key)
+            journal_length = self._journal_lengths.get(key)
+        if generation is None:
+            snapshot = self._read_snapshot(key)
+            if snapshot is None:
+                return 0
+            generation = snapshot[0]
+        journal_path = self._journal_path(key, generation)
+        if journal_length is None:
+            journal_length = len(self._read_journal(journal_path))
+        with open(journal_path, 'a', encoding='utf-8') as f:
+            f.write(encode_event(event) + "\n")
+        with self._lock:
+            self._generations[key] = generation
+            self._journal_lengths[key] = journal_length + 1
+        return journal_length + 1
+
+    def _read_journal(self, journal_path):
+        events = []
+        try:
+            with open(journal_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        events.append(decode_event(line))
+                    except ValueError:
+                        # A torn write can only affect the last line
+                        break
+        except FileNotFoundError:
+            pass
+        return events
+
+    def load(self, key):
+        snapshot = self._read_snapshot(key)
+        if snapshot is None:
+            return None
+        generation, blob, saved_at = snapshot
+        journal_path = self._journal_path(key, generation)
+        if os.path.exists(journal_path):
+            saved_at = max(saved_at, os.path.getmtime(journal_path))
+        if self._is_expired(saved_at):
+            self.delete(key)
+            return None
+        events = self._read_journal(journal_path)
+        with self._lock:
+            self._generations[key] = generation
+            self._journal_lengths[key] = len(events)
+        return pickle.loads(blob), events
+
+    def delete(self, key):
+        path = self._snapshot_path(key)
+        with self._lock:
+            self._generations.pop(key, None)
+            self._journal_lengths.pop(key, None)
+        for old_file in [path] + glob.glob(os.path.join(self.directory, f"{key}.*.journal")):
+            try:
+                os.remove(old_file)
+            except FileNotFoundError:
+                pass
+
+    def purge_expired(self):
+        cutoff = time.time() - self.max_age
+        for path in glob.glob(os.path.join(self.directory, "*.pkl")):
+            key = os.path.basename(path)[:-len(".pkl")]
+            if not is_valid_session_key(key):
+                continue
+            files = [path] + glob.glob(os.path.join(self.directory, f"{key}.*.journal"))
+            try:
+                if max(os.path.getmtime(name) for name in files) < cutoff:
+                    self.delete(key)
+            except FileNotFoundError:
+                # Saved or deleted while we looked; it isn't expired then
+                pass
+        # Journals left without a snapshot and temp files of interrupted saves
+        leftovers = glob.glob(os.path.join(self.directory, "*.journal")) + \
+            glob.glob(os.path.join(self.directory, ".*.tmp"))
+        for path in leftovers:
+            key = os.path.basename(path).lstrip(".").split(".")[0]
+            if path.endswith(".journal") and os.path.exists(os.path.join(self.directory, f"{key}.pkl")):
+                continue
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+class BackgroundSessionWriter(SessionStore):
+    """Wraps a store and performs its writes on a worker thread
+
+    Saves for the same session that arrive within `delay` seconds are coalesced, so
+    a burst of saves during one script run turns into a single write. Reads flush
+    the pending writes for that session first, so they always see the latest state.
+    """
+
+    def __init__(self, store, delay=0.2, purge_interval=SESSION_PURGE_INTERVAL):
+        super().__init__(store.max_age)
+        self.store = store
+        self.delay = delay
+        self.purge_interval = purge_interval
+        self._purged_at = time.monotonic()
+        # key -> [latest snapshot blob or None, events recorded after it]
+        self._pending = {}
+        self._journal_lengths = {}
+        self._cond = threading.Condition()
+        # Held while writing so batches reach the store in the order they were taken
+        self._io_lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="session-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def save_blob(self, key, blob):
+        with self._cond:
+            # A newer snapshot supersedes anything still queued for the session
+            self._pending[key] = [blob, []]
+            self._journal_lengths[key] = 0
+            self._cond.notify()
+
+    def append_event(self, key, event):
+        with self._cond:
+            journal_length = self._journal_lengths.get(key)
+            if journal_length is None:
+                # Unknown session in this process: ask the caller for a snapshot first
+                return 0
+            self._pending.setdefault(key, [None, []])[1].append(event)
+            self._journal_lengths[key] = journal_length + 1
+            self._cond.notify()
+            return journal_length + 1
+
+    def load(self, key):
+        self.flush(key)
+        record = self.store.load(key)
+        with self._cond:
+            if record is None:
+                self._journal_lengths.pop(key, None)
+            else:
+                self._journal_lengths[key] = len(record[1])
+        return record
+
+    def delete(self, key):
+        with self._io_lock:
+            with self._cond:
+                self._pending.pop(key, None)
+                self._journal_lengths.pop(key, None)
+            self.store.delete(key)
+
+    def purge_expired(self):
+        """Write pending saves, then delete expired sessions from the wrapped store"""
+        self.flush()
+        with self._io_lock:
+            try:
+                self.store.purge_expired()
+            except Exception as e:
+                print(f"Warning: Could not purge expired sessions: {e}")
+        self._purged_at = time.monotonic()
+
+    def flush(self, key=None):
+        """Write pending saves now, for one session or for all of them"""
+        with self._io_lock:
+            with self._cond:
+                if key is None:
+                    batch, self._pending = self._pending, {}
+                else:
+                    entry = self._pending.pop(key, None)
+                    batch = {key: entry} if entry else {}
+            self._write(batch)
+
+    def _write(self, batch):
+        for key, (blob, events) in batch.items():
+            try:
+                if blob is not None:
+                    self.store.save_blob(key, blob)
+                for event in events:
+                    self.store.append_event(key, event)
+            except Exception as e:
+                print(f"Warning: Could not write session {key}: {e}")
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    # Wake up for the periodic purge even when nobody is saving
+                    remaining = self._purged_at + self.purge_interval - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if self._closed:
+                    return
+            if self._pending:
+                # Give the rest of the burst a moment to arrive
+                time.sleep(self.delay)
+                self.flush()
+            if time.monotonic() - self._purged_at >= self.purge_interval:
+                self.purge_expired()
+
+    def close(self):
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        self.flush()
+        self.store.close()
+
+
+def create_session_store(backend=None, path=None, background=None):
+    """Create the session store selected by EXAM_SESSION_STORE ("sqlite", "file" or "memory")
+
+    Disk-backed stores are wrapped in a BackgroundSessionWriter unless
+    EXAM_SESSION_BACKGROUND is set to "0". Expired sessions are purged when the
+    store is created, and then every SESSION_PURGE_INTERVAL by the background writer.
+    """
+    backend = (backend or os.environ.get("EXAM_SESSION_STORE", "sqlite")).lower()
+    if background is None:
+        background = os.environ.get("EXAM_SESSION_BACKGROUND", "1") != "0"
+    if backend == "memory":
+        return MemorySessionStore()
+    if backend == "sqlite":
+        store = SQLiteSessionStore(path or os.environ.get("EXAM_SESSION_DB", "exam_sessions.db"))
+    elif backend == "file":
+        store = FileSessionStore(path or os.environ.get("EXAM_SESSION_DIR", "exam_sessions"))
+    else:
+        raise ValueError(f"Unknown session store backend: {backend}")
+    try:
+        store.purge_expired()
+    except Exception as e:
+        print(f"Warning: Could not purge expired sessions: {e}")
+    return BackgroundSessionWriter(store) if background else store
@@ -0,0 +1,19 @@
+from bank_dedup import find_duplicate_clusters
+
+
+def question(text, *options):
+    return {'question': text, 'options': dict(zip("ABCD", options)), 'correct_answer': 'A'}
+
+
+def test_exact_and_near_duplicates():
+    text = "Which of these is the best way to open a cover letter for a graduate role"
+    bank = [question(text, "x", "y"), question("Unrelated", "x"), question(text.upper() + "!", "y", "x"),
+            question(text + " today", "z")]
+    kinds = {cluster.kind: cluster.indices for cluster in find_duplicate_clusters(bank)}
+    assert kinds['exact'] == [0, 2]
+    assert kinds['near'] == [0, 3]
+
+
+def test_questions_without_words():
+    bank = [question("???", "a"), question("!!!", "b"), question("...", "c")]
+    assert find_duplicate_clusters(bank) == []
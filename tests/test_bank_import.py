@@ -0,0 +1,203 @@
+import io
+import json
+import os
+import tracemalloc
+
+import pytest
+
+from bank_import import (BankParseError, _JSONStreamReader, csv_row_to_question, detect_bank_format,
+                         extract_questions_from_data, find_bank_files, import_bank_files,
+                         iter_questions_from_text_stream, parse_bank_source, read_questions_from_stream,
+                         resolve_import_folder, validate_bank)
+
+
+class TrickleStream(io.StringIO):
+    """Returns at most `step` characters per read, to put chunk boundaries everywhere"""
+
+    def __init__(self, text, step):
+        super().__init__(text)
+        self.step = step
+
+    def read(self, size=-1):
+        return super().read(self.step)
+
+
+def question(text, **fields):
+    return dict({'question': text, 'options': {'A': 'yes', 'B': 'no'}, 'correct_answer': 'A'}, **fields)
+
+
+DOCUMENT = json.dumps({
+    'title': "Bank \"one\" [draft]",
+    'tags': ["a", {"nested": [1, 2.5e3, None]}],
+    'questions': [question("Unicode é ✓ \\ \"quoted\""), question("Second", id=12345678901234567890, page=7)],
+}, ensure_ascii=False, indent=1)
+
+
+@pytest.mark.parametrize("step", [1, 2, 3, 7, 64])
+def test_stream_parser_chunk_boundaries(step):
+    expected = json.loads(DOCUMENT)['questions']
+    assert list(iter_questions_from_text_stream(TrickleStream(DOCUMENT, step))) == expected
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 5])
+def test_numbers_split_across_chunks(chunk_size):
+    reader = _JSONStreamReader(io.StringIO("[12345, -6.5e-3, 7]"), chunk_size=chunk_size)
+    assert list(reader.items()) == [12345, -6.5e-3, 7]
+
+
+def test_truncated_document_is_a_parse_error():
+    with pytest.raises(BankParseError):
+        list(iter_questions_from_text_stream(TrickleStream(DOCUMENT[:-20], 5)))
+
+
+
+def traced(build):
+    """Return (result, bytes kept, peak bytes) of build()"""
+    tracemalloc.start()
+    try:
+        result = build()
+        kept, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, kept, peak
+
+
+def test_streaming_shares_keys_and_keeps_less_than_json_load():
+    payload = json.dumps({'questions': [question(f"Question {i}", topic="CV", explanation=f"Because {i}")
+                                        for i in range(3000)]}).encode('utf-8')
+    loaded, loaded_kept, loaded_peak = traced(lambda: extract_questions_from_data(json.loads(payload)))
+    del loaded
+    (streamed, _), streamed_kept, streamed_peak = traced(lambda: read_questions_from_stream(io.BytesIO(payload)))
+
+    first, last = streamed[0], streamed[-1]
+    assert all(a is b for a, b in zip(first, last))
+    assert all(a is b for a, b in zip(first['options'], last['options']))
+    assert streamed_kept <= loaded_kept * 1.02
+    assert streamed_peak < loaded_peak
+
+
+@pytest.mark.parametrize("data", [
+    [question("a"), question("b")],
+    {'questions': [question("a"), question("b")]},
+    {'meta': [1, 2], 'items': [question("a"), question("b")]},
+])
+def test_streaming_accepts_the_same_layouts_as_json_load(data):
+    streamed, _ = read_questions_from_stream(io.BytesIO(json.dumps(data).encode('utf-8')))
+    assert streamed == extract_questions_from_data(data)
+
+
+def test_latin1_fallback():
+    text = json.dumps([question("Café")], ensure_ascii=False).encode('latin-1')
+    questions, _ = read_questions_from_stream(io.BytesIO(text))
+    assert questions[0]['question'] == "Café"
+
+
+def test_validator_reports_and_skips_bad_items():
+    bank = [question("ok", id=1), {'question': "no options", 'correct_answer': 'A'},
+            question("bad answer", correct_answer='C'), question("duplicate id", id=1),
+            question("bad option", options={'A': 'yes', 'B': 2}),
+            question("too many options", options={f"O{i}": "x" for i in range(256)}, correct_answer='O0')]
+    questions, issues = read_questions_from_stream(io.BytesIO(json.dumps(bank).encode()))
+    assert [q['question'] for q in questions] == ["ok", "duplicate id"]
+    assert [(issue.index, issue.field, issue.severity) for issue in issues] == [
+        (1, 'options', 'error'), (2, 'correct_answer', 'error'), (3, 'id', 'warning'), (4, 'options', 'error'),
+        (5, 'options', 'error')]
+    assert validate_bank(bank) == issues
+
+
+def test_builtin_bank_is_valid():
+    path = os.path.join(os.path.dirname(__file__), os.pardir, "builtin_questions.json")
+    with open(path, encoding='utf-8') as f:
+        assert validate_bank(extract_questions_from_data(json.load(f))) == []
+
+
+def test_import_keeps_source_and_records_provenance():
+    bank = [question("first", source="Handbook p. 3"), {'question': "broken"}, question("third")]
+    result = parse_bank_source(("banks/a.json", json.dumps(bank).encode()))
+    assert [q['source'] for q in result.questions if 'source' in q] == ["Handbook p. 3"]
+    assert [q['provenance'] for q in result.questions] == [
+        {'file': "banks/a.json", 'item': 1}, {'file': "banks/a.json", 'item': 3}]
+    assert {issue.file for issue in result.issues} == {"banks/a.json"}
+
+
+def test_import_folder_in_parallel(tmp_path):
+    (tmp_path / "part").mkdir()
+    (tmp_path / "a.json").write_text(json.dumps([question("a1"), question("a2")]), encoding='utf-8')
+    (tmp_path / "part" / "b.json").write_text(json.dumps([question("b1"), {'question': "bad"}]), encoding='utf-8')
+    (tmp_path / "notes.txt").write_text("not a bank", encoding='utf-8')
+    (tmp_path / "broken.json").write_text("[{", encoding='utf-8')
+
+    paths = find_bank_files(str(tmp_path))
+    questions, reports = import_bank_files(paths, root=str(tmp_path), max_workers=2)
+    assert [q['question'] for q in questions] == ["a1", "a2", "b1"]
+    assert [(report.name, report.questions, len(report.issues)) for report in reports] == [
+        ("a.json", 2, 0), ("broken.json", 0, 0), (os.path.join("part", "b.json"), 1, 2)]
+    assert reports[1].error
+
+
+def test_import_folders_must_be_inside_the_root(tmp_path):
+    root = tmp_path / "banks"
+    (root / "chapters").mkdir(parents=True)
+    (tmp_path / "private").mkdir()
+    (root / "escape").symlink_to(tmp_path / "private")
+    assert resolve_import_folder("chapters", str(root)) == os.path.realpath(root / "chapters")
+    assert resolve_import_folder(str(root / "chapters"), str(root)) == os.path.realpath(root / "chapters")
+    for folder in ["..", "../private", "escape", str(tmp_path / "private"), "/"]:
+        with pytest.raises(ValueError, match="outside"):
+            resolve_import_folder(folder, str(root))
+    with pytest.raises(ValueError, match="not found"):
+        resolve_import_folder("missing", str(root))
+    with pytest.raises(ValueError, match="disabled"):
+        resolve_import_folder("chapters", None)
+
+
+def test_find_bank_files_skips_links_out_of_the_folder(tmp_path):
+    (tmp_path / "private").mkdir()
+    (tmp_path / "private" / "secret.json").write_text("[]", encoding='utf-8')
+    root = tmp_path / "banks"
+    root.mkdir()
+    (root / "a.json").write_text("[]", encoding='utf-8')
+    (root / "linked.json").symlink_to(tmp_path / "private" / "secret.json")
+    (root / "linked").symlink_to(tmp_path / "private")
+    assert find_bank_files(str(root)) == [os.path.join(os.path.realpath(root), "a.json")]
+
+
+def test_duplicate_ids_are_reported_across_files():
+    first = [question("a1", id=1), question("a2", id=2), question("a3", id=2)]
+    second = [question("b1", id=1), question("b2", id=3)]
+    questions, reports = import_bank_files([("a.json", json.dumps(first).encode()),
+                                            ("b.json", json.dumps(second).encode())])
+    assert len(questions) == 5
+    assert [[(issue.file, issue.index, issue.field, issue.severity) for issue in report.issues]
+            for report in reports] == [[("a.json", 2, 'id', 'warning')], [("b.json", 0, 'id', 'warning')]]
+    assert "first used by item 1 of a.json" in reports[1].issues[0].message
+
+
+def test_ndjson_reader_reports_bad_lines():
+    text = "\n".join([json.dumps(question("one")), "", "{not json", json.dumps(question("two")), '{"question": "torn'])
+    questions, issues = read_questions_from_stream(io.BytesIO(text.encode('utf-8')), bank_format='ndjson')
+    assert [q['question'] for q in questions] == ["one", "two"]
+    assert [issue.index for issue in issues] == [1, 3]
+    assert "line 3" in issues[0].message
+
+
+def test_csv_row_to_question():
+    row = {'ID': '7', 'Topic': 'CV', 'Question': ' What? ', 'A': 'yes', 'option_b': 'no', 'Option C': '',
+           'correct_answer': 'a', 'explanation': '', None: ['extra']}
+    assert csv_row_to_question(row) == {
+        'id': 7, 'topic': 'CV', 'question': 'What?', 'options': {'A': 'yes', 'B': 'no'}, 'correct_answer': 'A'}
+
+
+def test_csv_reader():
+    text = ("id,topic,question,A,B,correct_answer,explanation\r\n"
+            "1,CV,\"Line one\nline two, with comma\",yes,no,A,Because\r\n"
+            "2,CV,Missing answer,yes,no,C,\r\n")
+    questions, issues = read_questions_from_stream(io.BytesIO(text.encode('utf-8')), bank_format='csv')
+    assert questions == [{'id': 1, 'topic': 'CV', 'question': "Line one\nline two, with comma",
+                          'options': {'A': 'yes', 'B': 'no'}, 'correct_answer': 'A', 'explanation': 'Because'}]
+    assert [(issue.index, issue.field) for issue in issues] == [(1, 'correct_answer')]
+
+
+def test_detect_bank_format():
+    assert [detect_bank_format(name) for name in ["a.JSON", "b.ndjson", "c.jsonl", "d.csv", "e", None]] == [
+        'json', 'ndjson', 'ndjson', 'csv', 'json', 'json']
@@ -0,0 +1,79 @@
+import bank_index
+from bank_index import SearchIndex, TopicIndex, TopicTaxonomy, search_tokens
+
+
+def questions(*topics):
+    return [{'question': f"Q{i}", 'topic': topic} for i, topic in enumerate(topics)]
+
+
+def test_topic_index_select():
+    index = TopicIndex(questions("CV", "Interview", "CV", "Networking", "Interview", "CV"))
+    assert index.topics == ["CV", "Interview", "Networking"]
+    assert index.counts() == {"CV": 3, "Interview": 2, "Networking": 1}
+    assert index.counts(["Networking", "Missing"]) == {"Networking": 1, "Missing": 0}
+    assert list(index.select(["Networking", "CV", "CV"])) == [0, 2, 3, 5]
+    assert list(index.select([])) == []
+
+
+def test_questions_without_topic_are_general():
+    index = TopicIndex([{'question': "Q"}])
+    assert "General" in index and index.count("General") == 1
+
+
+def taxonomy(*topics):
+    return TopicTaxonomy(questions(*topics))
+
+
+def test_shared_prefixes_become_parents():
+    tree = taxonomy("CV Formatting", "CV Writing", "Networking")
+    assert tree.path("CV Writing") == ("CV", "CV Writing")
+    assert tree.path("Networking") == ("Networking",)
+    assert list(tree.walk()) == [("CV", 0), ("CV Formatting", 1), ("CV Writing", 1), ("Networking", 0)]
+
+
+def test_qualified_topic_sits_under_the_unqualified_one():
+    tree = taxonomy("Interview Assessment (Hard)", "Interview Assessment", "Interview Skills")
+    assert tree.path("Interview Assessment (Hard)") == (
+        "Interview", "Interview Assessment", "Interview Assessment (Hard)")
+    assert tree.children["Interview"] == ["Interview Assessment", "Interview Skills"]
+    assert tree.rollup({"Interview Assessment": 2, "Interview Assessment (Hard)": 1}) == {
+        "Interview": 3, "Interview Assessment": 3, "Interview Assessment (Hard)": 1}
+
+
+def test_declared_category_wins():
+    tree = TopicTaxonomy([{'topic': "Formatting (Hard)", 'category': "CV > Layout"}, {'topic': "Formatting"}])
+    assert tree.path("Formatting (Hard)") == ("CV", "Layout", "Formatting (Hard)")
+
+
+SEARCH_BANK = [
+    {'question': "How long should a CV be?", 'options': {'A': "A one page CV", 'B': "Ten pages"},
+     'explanation': "Recruiters skim a CV in seconds."},
+    {'question': "What is networking?", 'options': {'A': "Building relationships", 'B': "Cabling"}},
+    {'question': "Which CV section comes first?", 'options': {'A': "Profile", 'B': "Hobbies"},
+     'explanation': "Lead with your profile so the CV is read."},
+    {'question': "How do you follow up?", 'options': {'A': "Thank-you email", 'B': "Silence"},
+     'explanation': "A short email after networking events."},
+]
+
+
+def test_search_ranks_matches_in_question_options_and_explanation():
+    index = SearchIndex(SEARCH_BANK)
+    assert search_tokens("Thank-you CV!") == ["thank", "you", "cv"]
+    assert [position for position, _ in index.search("CV")] == [0, 2]
+    assert [position for position, _ in index.search("relationships")] == [1]
+    # The shorter question mentioning the term ranks higher
+    assert [position for position, _ in index.search("networking")] == [1, 3]
+    assert index.search("nothing matches") == []
+    assert index.search("") == []
+
+
+def test_search_filter_and_limit():
+    index = SearchIndex(SEARCH_BANK)
+    assert [position for position, _ in index.search("cv networking", limit=1)] == [0]
+    assert [position for position, _ in index.search("cv networking", accept=lambda p: p % 2)] == [1, 3]
+
+
+def test_search_reads_only_the_strongest_postings(monkeypatch):
+    monkeypatch.setattr(bank_index, 'SEARCH_POSTINGS_LIMIT', 1)
+    index = SearchIndex(SEARCH_BANK)
+    assert [position for position, _ in index.search("CV", limit=5)] == [0]
@@ -0,0 +1,143 @@
+import pickle
+
+import pytest
+
+from exam_state import STATUS_CORRECT, STATUS_FLAGGED, STATUS_UNANSWERED, STATUS_WRONG, ExamState
+from question_bank import BankView, freeze_value
+
+BANK = freeze_value([{'question': f"Q{i}", 'options': {'A': 'a', 'B': 'b'}, 'correct_answer': 'A'}
+                     for i in range(37)])
+
+
+OPTIONS = ('A', 'B', 'C', 'D')
+
+
+def test_counters_follow_changed_answers():
+    exam = ExamState(4)
+    exam.answer(0, 'A', True, ('CV', 'CV Writing'), options=OPTIONS)
+    exam.answer(1, 'B', False, ('CV',), options=OPTIONS)
+    assert (exam.answered_count, exam.score) == (2, 1)
+    assert exam.accuracy == 0.5
+    exam.answer(1, 'A', True, ('CV',), options=OPTIONS)
+    exam.answer(0, 'C', False, ('CV', 'CV Writing'), options=OPTIONS)
+    assert (exam.answered_count, exam.score) == (2, 1)
+    assert exam.topic_progress == {'CV': [2, 1], 'CV Writing': [1, 0]}
+    assert exam.answer_of(0, OPTIONS) == 'C' and exam.answer_of(2, OPTIONS) is None
+    assert exam.result_of(0) is False and exam.result_of(1) is True and exam.result_of(3) is None
+
+
+def test_answers_index_each_questions_own_options():
+    # Every question with its own labels, far more distinct labels than fit in a byte
+    options = [tuple(f"q{i}{letter}" for letter in "abcd") for i in range(300)]
+    exam = ExamState(len(options))
+    for index, labels in enumerate(options):
+        exam.answer(index, labels[index % 4], index % 4 == 0, options=labels)
+    assert [exam.answer_of(index, labels) for index, labels in enumerate(options)] == [
+        labels[index % 4] for index, labels in enumerate(options)]
+    assert (exam.answered_count, exam.score) == (300, 75)
+    with pytest.raises(ValueError):
+        exam.answer(0, 'q1a', True, options=options[0])
+
+
+def test_recount_topics_from_the_answers():
+    exam = ExamState(4)
+    exam.answer(0, 'A', True, ('Old',), options=OPTIONS)
+    exam.answer(2, 'B', False, ('Old',), options=OPTIONS)
+    paths = {0: ('CV', 'CV Writing'), 1: ('CV',), 2: ('Interviews',), 3: ('CV',)}
+    exam.recount_topics(paths.__getitem__)
+    assert exam.topic_progress == {'CV': [1, 1], 'CV Writing': [1, 1], 'Interviews': [1, 0]}
+
+
+def test_apply_journal_events():
+    exam = ExamState(5)
+    for event in [['answer', 0, 'A', True], ['answer', 0, 'B', False], ['goto', 3],
+                  ['answer', 3, 'A', True], ['retry'], ['finish']]:
+        exam.apply(event, lambda index: ('Topic', f"Topic {index}"), lambda index: OPTIONS)
+    assert (exam.answered_count, exam.score) == (2, 1)
+    assert exam.topic_progress == {'Topic': [2, 1], 'Topic 0': [1, 0], 'Topic 3': [1, 1]}
+    assert exam.current_question == 3
+    assert exam.exam_completed and not exam.answered
+    # A journaled answer the question no longer offers is skipped
+    exam.apply(['answer', 1, 'Z', True], options_of=lambda index: OPTIONS)
+    assert exam.answered_count == 2
+    exam.apply(['reset'])
+    assert exam.answered_count == 0 and not exam.exam_completed and exam.topic_progress == {}
+
+
+def test_mask_and_positions():
+    exam = ExamState(12)
+    exam.answer(1, 'A', True, options=OPTIONS)
+    exam.answer(4, 'B', False, options=OPTIONS)
+    exam.answer(10, 'A', True, options=OPTIONS)
+    exam.flag(4)
+    assert list(ExamState.positions(exam.mask('answered'))) == [1, 4, 10]
+    assert list(ExamState.positions(exam.mask('correct'))) == [1, 10]
+    assert list(ExamState.positions(exam.mask('wrong'))) == [4]
+    assert list(ExamState.positions(exam.mask('flagged'))) == [4]
+    assert list(ExamState.positions(exam.mask('unanswered'))) == [0, 2, 3, 5, 6, 7, 8, 9, 11]
+    assert exam.statuses([0, 1, 4]) == bytearray([STATUS_UNANSWERED, STATUS_CORRECT, STATUS_WRONG | STATUS_FLAGGED])
+    with pytest.raises(ValueError):
+        exam.mask('skipped')
+
+
+def test_flags_are_counted_once():
+    exam = ExamState(3)
+    exam.apply(['flag', 2, True])
+    exam.apply(['flag', 2, True])
+    assert exam.flagged_count == 1 and exam.is_flagged(2)
+    exam.apply(['flag', 2, False])
+    assert exam.flagged_count == 0 and not exam.is_flagged(2)
+
+
+def test_next_position_wraps_around():
+    exam = ExamState(10)
+    mask = 1 << 2 | 1 << 7
+    assert exam.next_position(mask, after=2) == 7
+    assert exam.next_position(mask, after=7) == 2
+    assert exam.next_position(0) is None
+
+
+def test_state_survives_pickling():
+    exam = ExamState(20)
+    exam.answer(19, 'D', False, options=OPTIONS)
+    exam.flag(3)
+    restored = pickle.loads(pickle.dumps(exam))
+    assert restored.answer_of(19, OPTIONS) == 'D' and restored.is_flagged(3)
+    assert restored.mask('wrong') == exam.mask('wrong')
+
+
+@pytest.mark.parametrize("seed", [0, 1, 12345])
+def test_answers_and_flags_follow_their_questions_after_a_shuffle(seed):
+    view = BankView(BANK)
+    exam = ExamState(len(view))
+    for index, option in [(0, 'A'), (5, 'B'), (8, 'A'), (36, 'B')]:
+        exam.answer(index, option, option == view[index]['correct_answer'], options=view[index]['options'])
+    exam.flag(5)
+    exam.flag(20)
+    before = {view[i]['question']: (exam.answer_of(i, view[i]['options']), exam.is_flagged(i)) for i in range(len(view))}
+    totals = (exam.answered_count, exam.score, exam.flagged_count)
+
+    exam.permute(view.shuffle(seed))
+
+    after = {view[i]['question']: (exam.answer_of(i, view[i]['options']), exam.is_flagged(i)) for i in range(len(view))}
+    assert after == before
+    assert (exam.answered_count, exam.score, exam.flagged_count) == totals
+    wrong = [view[i]['question'] for i in ExamState.positions(exam.mask('wrong'))]
+    assert sorted(wrong) == ["Q36", "Q5"]
+    flagged = [view[i]['question'] for i in ExamState.positions(exam.mask('flagged'))]
+    assert sorted(flagged) == ["Q20", "Q5"]
+    assert exam.current_question == 0
+
+
+def test_shuffle_order_depends_only_on_the_seed():
+    first, second = BankView(BANK), BankView(BANK, range(30, -1, -2))
+    second.shuffle(99)
+    first.shuffle(7)
+    second.shuffle(7)
+    assert sorted(first.order) == list(range(len(BANK)))
+    assert sorted(second.order) == list(range(0, 31, 2))
+    fresh, fresh_subset = BankView(BANK), BankView(BANK, range(0, 31, 2))
+    fresh.shuffle(7)
+    fresh_subset.shuffle(7)
+    assert list(fresh.order) == list(first.order)
+    assert list(fresh_subset.order) == list(second.order)
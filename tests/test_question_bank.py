@@ -0,0 +1,214 @@
+import json
+import os
+import tracemalloc
+
+import pytest
+
+import question_bank
+from question_bank import (BankRegistry, BankStore, CompiledBank, canonical_bank_json, compile_bank,
+                           compute_bank_hash, freeze_value, thaw_value)
+
+
+def question(text, **fields):
+    return dict({'question': text, 'options': {'A': 'yes', 'B': 'no'}, 'correct_answer': 'A'}, **fields)
+
+
+def make_bank(size=10):
+    """A fresh bank; registering a bank freezes its dicts in place"""
+    return [question(f"Question {i}", topic=f"Topic {i % 3}") for i in range(size)]
+
+
+BANK = make_bank()
+
+
+def test_equal_banks_hash_equally():
+    reordered = [dict(reversed(list(q.items()))) for q in BANK]
+    assert compute_bank_hash(reordered) == compute_bank_hash(BANK)
+    assert compute_bank_hash(BANK[1:]) != compute_bank_hash(BANK)
+
+
+def test_bank_store_round_trip(tmp_path):
+    store = BankStore(str(tmp_path))
+    bank_hash = store.put(BANK)
+    assert bank_hash == compute_bank_hash(BANK)
+    assert bank_hash in store
+    assert store.get(bank_hash) == BANK
+    assert store.put(BANK) == bank_hash
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_bank_store_rejects_bad_hashes(tmp_path):
+    store = BankStore(str(tmp_path))
+    assert store.get("0" * 64) is None
+    with pytest.raises(ValueError):
+        store.get("../secrets")
+
+
+def test_registry_shares_one_frozen_bank(tmp_path):
+    registry = BankRegistry(BankStore(str(tmp_path)))
+    bank_hash = registry.register(make_bank())
+    assert registry.register(make_bank()) == bank_hash
+    first, second = registry.view(bank_hash), registry.view(bank_hash)
+    assert first.bank is second.bank
+    with pytest.raises(TypeError):
+        first[0]['question'] = "changed"
+    assert thaw_value(first.bank) == BANK
+
+
+def test_registry_reloads_banks_from_the_store(tmp_path):
+    bank_hash = BankRegistry(BankStore(str(tmp_path))).register(make_bank())
+    registry = BankRegistry(BankStore(str(tmp_path)))
+    assert list(map(thaw_value, registry.view(bank_hash))) == BANK
+    assert registry.view("f" * 64) is None
+
+
+def test_derived_data_is_built_once_per_bank(tmp_path):
+    registry = BankRegistry(BankStore(str(tmp_path)))
+    bank_hash = registry.register(make_bank())
+    builds = []
+    build = lambda bank: builds.append(bank) or len(bank)
+    assert registry.derived(bank_hash, 'size', build) == 10
+    assert registry.derived(bank_hash, 'size', build) == 10
+    assert len(builds) == 1
+
+
+
+
+def test_registering_freezes_in_place_without_a_whole_bank_copy(tmp_path):
+    def peak_memory(build):
+        tracemalloc.start()
+        try:
+            result = build()
+            return result, tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    registry = BankRegistry(BankStore(str(tmp_path)))
+    questions, copied = make_bank(3000), make_bank(3000)
+    _, copy_peak = peak_memory(lambda: freeze_value(copied))
+    bank_hash, peak = peak_memory(lambda: registry.register(questions))
+    # Less than serializing the bank as a whole, and far less than a frozen copy
+    assert peak < len(canonical_bank_json(questions))
+    assert peak < copy_peak / 3
+    assert registry.get(bank_hash)[0] == questions[0]
+    # Registering the same, now frozen, questions again finds the same bank
+    assert registry.register(questions) == bank_hash == compute_bank_hash(make_bank(3000))
+
+
+def test_registry_evicts_the_least_recently_used_bank(tmp_path):
+    registry = BankRegistry(BankStore(str(tmp_path)), cache_size=2)
+    hashes = [registry.register(make_bank(size)) for size in (3, 4)]
+    registry.derived(hashes[1], 'size', len)
+    view = registry.view(hashes[0])
+    registry.derived(hashes[0], 'size', len)
+
+    # The first bank was used last, so adding a third evicts the second
+    third = registry.register(make_bank(5))
+    assert list(registry._banks) == [hashes[0], third]
+    assert set(registry._derived) == {hashes[0]}
+
+    # Evicted banks come back from the store; views already handed out keep working
+    assert len(registry.view(hashes[1])) == 4
+    assert list(registry._banks) == [third, hashes[1]]
+    assert thaw_value(view[2]) == BANK[2]
+
+
+def test_register_file_parses_again_only_when_the_file_changes(tmp_path):
+    registry = BankRegistry(BankStore(str(tmp_path / "store")))
+    path = tmp_path / "bank.json"
+    path.write_text(json.dumps({'questions': BANK}), encoding='utf-8')
+    parsed = []
+
+    def extract(data):
+        parsed.append(data)
+        return data['questions']
+
+    bank_hash = registry.register_file(str(path), extract)
+    assert registry.register_file(str(path), extract) == bank_hash
+    assert len(parsed) == 1
+
+    path.write_text(json.dumps({'questions': BANK[:5]}), encoding='utf-8')
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    changed_hash = registry.register_file(str(path), extract)
+    assert len(parsed) == 2
+    assert changed_hash != bank_hash and len(registry.view(changed_hash)) == 5
+
+
+def test_register_file_without_questions(tmp_path):
+    registry = BankRegistry(BankStore(str(tmp_path / "store")))
+    path = tmp_path / "empty.json"
+    path.write_text("{}", encoding='utf-8')
+    assert registry.register_file(str(path), lambda data: None) is None
+
+
+def test_compiled_bank_random_access(tmp_path):
+    path = str(tmp_path / "bank.qbank")
+    assert compile_bank(iter(BANK), path) == len(BANK)
+    bank = CompiledBank(path)
+    try:
+        assert len(bank) == len(BANK)
+        assert thaw_value(bank[7]) == BANK[7]
+        assert thaw_value(bank[-1]) == BANK[-1]
+        assert [thaw_value(q) for q in bank] == BANK
+        with pytest.raises(IndexError):
+            bank[len(BANK)]
+    finally:
+        bank.close()
+
+
+def test_compiled_bank_rejects_other_files(tmp_path):
+    path = tmp_path / "bank.qbank"
+    path.write_bytes(b"{}" * 20)
+    with pytest.raises(ValueError):
+        CompiledBank(str(path))
+
+
+def test_large_banks_are_served_compiled(tmp_path, monkeypatch):
+    monkeypatch.setattr(question_bank, 'COMPILED_BANK_THRESHOLD', 5)
+    registry = BankRegistry(BankStore(str(tmp_path)))
+    bank_hash = registry.register(make_bank())
+    assert isinstance(registry.get(bank_hash), CompiledBank)
+    assert isinstance(BankRegistry(BankStore(str(tmp_path))).get(bank_hash), CompiledBank)
+    assert thaw_value(registry.view(bank_hash)[3]) == BANK[3]
+
+
+def test_put_compiles_a_streamed_bank_in_the_same_pass(tmp_path):
+    store = BankStore(str(tmp_path))
+    bank_hash = store.put((q for q in make_bank()), compiled=True)
+    assert bank_hash == compute_bank_hash(BANK)
+    assert store.get(bank_hash) == BANK
+    bank = store.get_compiled(bank_hash)
+    try:
+        assert [thaw_value(q) for q in bank] == BANK
+    finally:
+        bank.close()
+    assert sorted(os.listdir(tmp_path)) == [f"{bank_hash}.json", f"{bank_hash}.qbank"]
+
+
+def test_cli_validates_and_stores_the_bank_compiled(tmp_path, capsys):
+    source = tmp_path / "bank.ndjson"
+    lines = [json.dumps(q) for q in BANK[:2]] + [json.dumps({'question': "no options", 'correct_answer': 'A'})]
+    source.write_text("\n".join(lines), encoding='utf-8')
+    store_dir = str(tmp_path / "store")
+    assert question_bank.main([str(source), "--store", store_dir]) == 0
+    bank_hash = compute_bank_hash(BANK[:2])
+    output = capsys.readouterr().out
+    assert "Error: item 3 options: missing required field" in output
+    assert f"?bank={bank_hash}" in output
+    assert [q['question'] for q in BankRegistry(BankStore(store_dir)).view(bank_hash)] == [
+        "Question 0", "Question 1"]
+
+    empty = tmp_path / "empty.json"
+    empty.write_text("[]", encoding='utf-8')
+    assert question_bank.main([str(empty), "--store", store_dir]) == 1
+
+
+def test_register_file_skips_invalid_questions(tmp_path):
+    registry = BankRegistry(BankStore(str(tmp_path / "store")))
+    path = tmp_path / "bank.json"
+    path.write_text(json.dumps([BANK[0], {'question': "no options", 'correct_answer': 'A'}, BANK[1]]),
+                    encoding='utf-8')
+    bank_hash = registry.register_file(str(path), lambda data: data)
+    assert [q['question'] for q in registry.view(bank_hash)] == ["Question 0", "Question 1"]
+    assert [(issue.index, issue.field) for issue in registry.file_issues(str(path))] == [(1, 'options')]
@@ -0,0 +1,227 @@
+import os
+import time
+
+import pytest
+
+from session_store import (BackgroundSessionWriter, FileSessionStore, MemorySessionStore, SQLiteSessionStore,
+                           create_session_store, is_valid_session_key, new_session_key)
+
+
+@pytest.fixture(params=["memory", "sqlite", "file"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        store = MemorySessionStore()
+    elif request.param == "sqlite":
+        store = SQLiteSessionStore(str(tmp_path / "sessions.db"))
+    else:
+        store = FileSessionStore(str(tmp_path / "sessions"))
+    yield store
+    store.close()
+
+
+def test_session_keys():
+    key = new_session_key()
+    assert is_valid_session_key(key)
+    assert new_session_key() != key
+    assert not is_valid_session_key("../../etc")
+    assert not is_valid_session_key(None)
+
+
+def test_snapshot_is_a_copy(store):
+    key = new_session_key()
+    data = {'answers': {}}
+    store.save(key, data)
+    data['answers'][0] = 'A'
+    assert store.load(key)[0] == {'answers': {}}
+
+
+def test_sessions_are_kept_apart(store):
+    first, second = new_session_key(), new_session_key()
+    store.save(first, {'score': 1})
+    store.save(second, {'score': 2})
+    assert store.load(first)[0] == {'score': 1}
+    assert store.load(second)[0] == {'score': 2}
+
+
+def test_delete_and_expiry(store):
+    key = new_session_key()
+    store.save(key, {})
+    store.delete(key)
+    assert store.load(key) is None
+
+    store.save(key, {})
+    store.max_age = 0
+    assert store.load(key) is None
+
+
+def test_snapshot_and_journal_round_trip(store):
+    key = new_session_key()
+    store.save(key, {'current_question': 0, 'answers': {}})
+    assert store.append_event(key, ['answer', 0, 'A', True]) == 1
+    assert store.append_event(key, ['goto', 1]) == 2
+
+    snapshot, events = store.load(key)
+    assert snapshot == {'current_question': 0, 'answers': {}}
+    assert events == [['answer', 0, 'A', True], ['goto', 1]]
+
+
+def test_events_without_snapshot_are_refused(store):
+    key = new_session_key()
+    assert store.append_event(key, ['goto', 1]) == 0
+    assert store.load(key) is None
+
+
+def test_snapshot_compacts_the_journal(store):
+    key = new_session_key()
+    store.save(key, {'generation': 1})
+    store.append_event(key, ['goto', 1])
+    store.append_event(key, ['goto', 2])
+    store.save(key, {'generation': 2})
+    assert store.append_event(key, ['goto', 3]) == 1
+
+    snapshot, events = store.load(key)
+    assert snapshot == {'generation': 2}
+    assert events == [['goto', 3]]
+
+
+def test_file_store_journals_follow_the_snapshot_generation(tmp_path):
+    directory = tmp_path / "sessions"
+    store = FileSessionStore(str(directory))
+    key = new_session_key()
+    store.save(key, {'generation': 1})
+    store.append_event(key, ['goto', 1])
+    store.save(key, {'generation': 2})
+    store.append_event(key, ['goto', 2])
+
+    journals = [name for name in os.listdir(directory) if name.endswith(".journal")]
+    assert len(journals) == 1
+
+    # A fresh process finds the generation from the snapshot and keeps counting
+    reopened = FileSessionStore(str(directory))
+    assert reopened.append_event(key, ['goto', 3]) == 2
+    assert reopened.load(key) == ({'generation': 2}, [['goto', 2], ['goto', 3]])
+
+
+def test_file_store_ignores_a_torn_last_event(tmp_path):
+    store = FileSessionStore(str(tmp_path))
+    key = new_session_key()
+    store.save(key, {})
+    store.append_event(key, ['goto', 1])
+    journal = next(name for name in os.listdir(tmp_path) if name.endswith(".journal"))
+    with open(tmp_path / journal, 'a', encoding='utf-8') as f:
+        f.write('["goto",')
+    assert store.load(key) == ({}, [['goto', 1]])
+
+
+def test_file_store_leaves_no_temp_files(tmp_path):
+    store = FileSessionStore(str(tmp_path))
+    key = new_session_key()
+    for generation in range(3):
+        store.save(key, {'generation': generation})
+    assert sorted(name.endswith(".pkl") for name in os.listdir(tmp_path)) == [True]
+
+
+class CountingStore(MemorySessionStore):
+    def __init__(self):
+        super().__init__()
+        self.snapshots = 0
+
+    def save_blob(self, key, blob):
+        self.snapshots += 1
+        super().save_blob(key, blob)
+
+
+def test_background_writer_coalesces_saves():
+    inner = CountingStore()
+    writer = BackgroundSessionWriter(inner, delay=60)
+    key = new_session_key()
+    try:
+        for generation in range(10):
+            writer.save(key, {'generation': generation})
+        assert writer.append_event(key, ['goto', 1]) == 1
+        assert inner.snapshots == 0
+
+        # Reading flushes the pending writes first
+        assert writer.load(key) == ({'generation': 9}, [['goto', 1]])
+        assert inner.snapshots == 1
+    finally:
+        writer.close()
+
+
+def test_background_writer_asks_for_a_snapshot_first():
+    writer = BackgroundSessionWriter(MemorySessionStore(), delay=0)
+    key = new_session_key()
+    try:
+        assert writer.append_event(key, ['goto', 1]) == 0
+        writer.save(key, {})
+        assert writer.append_event(key, ['goto', 1]) == 1
+    finally:
+        writer.close()
+
+
+def test_background_writer_flushes_on_close(tmp_path):
+    writer = BackgroundSessionWriter(FileSessionStore(str(tmp_path)), delay=60)
+    key = new_session_key()
+    writer.save(key, {'answers': {0: 'A'}})
+    writer.append_event(key, ['goto', 1])
+    writer.close()
+    assert FileSessionStore(str(tmp_path)).load(key) == ({'answers': {0: 'A'}}, [['goto', 1]])
+
+
+def test_create_session_store(tmp_path):
+    assert isinstance(create_session_store("memory"), MemorySessionStore)
+    store = create_session_store("file", str(tmp_path), background=True)
+    try:
+        assert isinstance(store.store, FileSessionStore)
+    finally:
+        store.close()
+    with pytest.raises(ValueError):
+        create_session_store("redis")
+
+
+def test_purge_expired(store):
+    old, fresh = new_session_key(), new_session_key()
+    store.save(old, {'session': "old"})
+    store.append_event(old, ['goto', 1])
+    store.max_age = 0
+    store.purge_expired()
+    store.max_age = 3600
+    store.save(fresh, {'session': "fresh"})
+    store.purge_expired()
+    assert store.load(old) is None
+    assert store.load(fresh) == ({'session': "fresh"}, [])
+
+
+def test_file_store_purges_leftover_files(tmp_path):
+    store = FileSessionStore(str(tmp_path))
+    key = new_session_key()
+    store.save(key, {})
+    orphan = tmp_path / f"{new_session_key()}.123.journal"
+    orphan.write_text('["goto",1]\n', encoding='utf-8')
+    temp = tmp_path / f".{key}.abc.tmp"
+    temp.write_bytes(b"partial")
+    for path in (orphan, temp):
+        os.utime(path, (0, 0))
+    store.purge_expired()
+    assert os.listdir(tmp_path) == [f"{key}.pkl"]
+
+
+def test_background_writer_purges_periodically():
+    inner = MemorySessionStore(max_age=0)
+    inner.save(new_session_key(), {})
+    writer = BackgroundSessionWriter(inner, delay=0, purge_interval=0.01)
+    try:
+        deadline = time.monotonic() + 5
+        while inner._sessions and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert not inner._sessions
+    finally:
+        writer.close()
+
+
+def test_disk_stores_are_purged_when_created(tmp_path):
+    key = new_session_key()
+    FileSessionStore(str(tmp_path)).save(key, {})
+    os.utime(tmp_path / f"{key}.pkl", (0, 0))
+    create_session_store("file", str(tmp_path), background=False)
+    assert os.listdir(tmp_path) == []
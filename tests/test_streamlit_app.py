@@ -0,0 +1,105 @@
+import os
+
+import pytest
+
+pytest.importorskip("streamlit")
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def app_environment(tmp_path, monkeypatch):
+    monkeypatch.setenv("EXAM_SESSION_STORE", "memory")
+    monkeypatch.setenv("EXAM_BANK_DIR", str(tmp_path / "banks"))
+
+
+def client_batch_script():
+    import streamlit as st
+
+    import streamlit_app as app
+
+    if 'exam' not in st.session_state:
+        registry = app.get_bank_registry()
+        bank = [{'question': f"Q{i}", 'options': {'A': "a", 'B': "b"}, 'correct_answer': 'A'} for i in range(5)]
+        app.initialize_exam_state(registry.view(registry.register(bank)))
+    st.session_state.finished = [app.apply_client_batch(batch) for batch in st.session_state.batches]
+
+
+def test_client_batches_are_applied_once():
+    at = AppTest.from_function(client_batch_script)
+    first = {'id': "1", 'answers': [[0, 'A'], [1, 'B']], 'position': 2, 'finish': False}
+    at.session_state.batches = [first]
+    at.run()
+    exam = at.session_state.exam
+    assert (exam.answered_count, exam.score, exam.current_question) == (2, 1, 2)
+
+    # The component returns its last batch on every rerun; only a new id is applied
+    at.session_state.batches = [first, first]
+    at.run()
+    assert at.session_state.exam.answered_count == 2
+
+    # Out-of-range positions and unknown options are ignored, and answers are graded on the server
+    second = {'id': "2", 'answers': [[3, 'Z'], [9, 'A'], [2, 'A'], ["1", 'A']], 'position': 4, 'finish': True}
+    at.session_state.batches = [second]
+    at.run()
+    exam = at.session_state.exam
+    assert not at.exception
+    assert at.session_state.finished == [True]
+    assert (exam.answered_count, exam.score, exam.current_question, exam.exam_completed) == (3, 2, 4, True)
+
+
+APP_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "streamlit_app.py")
+
+
+def test_bank_link_opens_a_stored_bank(tmp_path):
+    from question_bank import BankStore
+
+    bank = [{'question': f"Linked {i}", 'options': {'A': "a", 'B': "b"}, 'correct_answer': 'A'} for i in range(3)]
+    bank_hash = BankStore(str(tmp_path / "banks")).put(bank, compiled=True)
+    at = AppTest.from_file(APP_FILE)
+    at.query_params["bank"] = bank_hash
+    at.run()
+    assert not at.exception
+    assert at.session_state.bank_hash == bank_hash
+    assert len(at.session_state.questions) == 3
+
+    # An unknown hash falls back to the default bank with a warning
+    at = AppTest.from_file(APP_FILE)
+    at.query_params["bank"] = "0" * 64
+    at.run()
+    assert not at.exception
+    assert at.session_state.bank_hash != bank_hash
+    assert any("not in the bank store" in warning.value for warning in at.warning)
+
+
+def upload_script():
+    import streamlit as st
+
+    import streamlit_app as app
+
+    registry = app.get_bank_registry()
+    if 'exam' not in st.session_state:
+        bank = [{'question': f"Q{i}", 'options': {'A': "a", 'B': "b"}, 'correct_answer': 'A', 'topic': "Old"}
+                for i in range(3)]
+        app.initialize_exam_state(registry.view(registry.register(bank)))
+        app.shuffle_questions(7)
+        app.exam_transition('answer', 0, 'A', True)
+    else:
+        bank = [{'question': f"New {i}", 'options': {'A': "a", 'B': "b"}, 'correct_answer': 'A',
+                 'topic': "CV: Writing" if i else "Interviews"} for i in range(3)]
+        app.use_uploaded_questions(registry.view(registry.register(bank)))
+
+
+def test_same_size_upload_keeps_answers_and_refreshes_topics():
+    at = AppTest.from_function(upload_script)
+    at.run()
+    assert at.session_state.question_seed == 7
+    assert at.session_state.exam.topic_progress == {"Old": [1, 1]}
+
+    at.run()
+    assert not at.exception
+    state = at.session_state
+    assert state.question_seed is None and state.selected_topics is None
+    assert set(state.topics) == {"Interviews", "CV: Writing"}
+    assert state.exam.answered_count == 1
+    # The answer stays at position 0, now the Interviews question
+    assert state.exam.topic_progress == {"Interviews": [1, 1]}